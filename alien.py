@@ -1,4 +1,3 @@
-import pygame
 from pygame.sprite import Sprite
 from typing import TYPE_CHECKING
 
@@ -8,25 +7,25 @@ if TYPE_CHECKING:
 class Alien(Sprite):
     """A class to manage aliens."""
 
-    def __init__(self, fleet: 'AlienFleet', x: float, y: float):
+    def __init__(self, fleet: 'AlienFleet', x: float, y: float, image=None):
         """Create a alien object and set it's screen position.
 
         Args:
-            game (AlienInvasion): An instance of the AlienInvasion game class.
-            This provides access to game resources like settings.
+            fleet (AlienFleet): The fleet this alien belongs to. This provides
+            access to game resources like settings and the alien image.
+            x (float): The horizontal starting position.
+            y (float): The vertical starting position.
+            image (pygame.Surface, optional): The image to draw. Defaults to
+            the fleet's alien image.
         """
         super().__init__()
         self.fleet = fleet
-        self.screen = fleet.game.screen
-        self.boundaries = fleet.game.screen.get_rect()
+        self.renderer = fleet.game.renderer
+        self.boundaries = fleet.game.renderer.boundaries
         self.settings = fleet.game.settings
 
-        # load the alien image, scale and rotate it.
-        self.image = pygame.image.load(self.settings.alien_file)
-        self.image = pygame.transform.scale(self.image, 
-            (self.settings.alien_w, self.settings.alien_h)
-            )
-        self.image = pygame.transform.rotate(self.image, self.settings.alien_rotate)
+        # share the fleet's scaled and rotated alien image
+        self.image = image if image is not None else fleet.alien_image
         self.rect = self.image.get_rect()
         
         # start each new alien at the specified position
@@ -63,4 +62,4 @@ class Alien(Sprite):
 
     def draw_alien(self):
         """Draw the alien to the screen."""
-        self.screen.blit(self.image, self.rect)
+        self.renderer.blit(self.image, self.rect)
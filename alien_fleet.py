@@ -8,6 +8,10 @@ if TYPE_CHECKING:
 class AlienFleet:
     """Manages the creation, movement and destruction of the alien fleet.
     """
+    # 'checker' leaves a gap around every alien, 'columns' fills every other
+    # column and 'block' fills the whole rectangle
+    FORMATIONS = ('checker', 'columns', 'block')
+
     def __init__(self, game: 'AlienInvasion'):
         """Initializes the AlienFleet.
 
@@ -19,11 +23,118 @@ class AlienFleet:
         self.fleet = pygame.sprite.Group()
         self.fleet_direction = self.settings.fleet_direction
         self.fleet_drop_speed = self.settings.fleet_drop_speed
+        # load the alien image once so every alien can share it
+        self.alien_image = self.load_alien_image()
+        # aliens sharing a horizontal lane, nearest the ship first, and the
+        # index of the frontmost alien still alive in each lane
+        self.lanes = []
+        self.lane_fronts = []
+        # alien positions keyed by formation name; the sizes they follow
+        # from never change during a game, so each is computed once
+        self._formations = {}
 
         self.create_fleet()
 
-    def create_fleet(self):
-        """Creates the initial alien fleet."""
+    def load_alien_image(self):
+        """Get the scaled and rotated alien image from the texture atlas.
+
+        Returns:
+            pygame.Surface: The alien image ready to be shared by the fleet.
+        """
+        return self.game.atlas.get('alien')
+
+    def create_fleet(self, aliens=None):
+        """Creates the initial alien fleet.
+
+        Args:
+            aliens (list, optional): Aliens that were already built for this
+                fleet, for example by the LevelPrefetcher. If omitted the
+                formation is calculated and the aliens are created here.
+        """
+        if aliens is None:
+            aliens = self.build_aliens(self.calculate_formation())
+        self.fleet.add(aliens)
+        self._index_lanes()
+
+    def _index_lanes(self):
+        """Group the fleet's aliens into horizontal lanes, ordered from the
+        alien nearest the ship to the farthest.
+        """
+        lanes = {}
+        alien: Alien
+        for alien in self.fleet:
+            lanes.setdefault(alien.rect.y, []).append(alien)
+        self.lanes = [
+            sorted(lane, key=lambda alien: alien.x)
+            for _, lane in sorted(lanes.items())
+            ]
+        self.lane_fronts = [0] * len(self.lanes)
+
+    def front_aliens(self):
+        """Finds the alien nearest the ship in every lane.
+
+        Dead aliens are skipped by moving each lane's front index forward,
+        so this takes time proportional to the number of lanes rather than
+        the number of aliens.
+
+        Returns:
+            list: The frontmost living alien of each lane that has one.
+        """
+        fronts = []
+        for i, lane in enumerate(self.lanes):
+            front = self.lane_fronts[i]
+            while front < len(lane) and not lane[front].alive():
+                front += 1
+            self.lane_fronts[i] = front
+            if front < len(lane):
+                fronts.append(lane[front])
+        return fronts
+
+    def build_aliens(self, formation, alien_image=None):
+        """Creates aliens for the given formation without adding them to the fleet.
+
+        Args:
+            formation (list): The (x, y) positions of the aliens.
+            alien_image (pygame.Surface, optional): The image to give the new
+                aliens. Defaults to the fleet's current alien image.
+
+        Returns:
+            list: The newly created aliens.
+        """
+        return [Alien(self, x, y, alien_image) for x, y in formation]
+
+    def calculate_formation(self, formation=None):
+        """Calculates the positions of every alien in the formation.
+
+        Args:
+            formation (str, optional): The name of the formation, one of
+                FORMATIONS. Defaults to the current level's formation.
+
+        Returns:
+            list: A list of (x, y) tuples, one for each alien. The list is
+            shared, so do not change it.
+        """
+        if formation is None:
+            formation = self.settings.formation
+        if formation not in self.FORMATIONS:
+            raise ValueError(f'Unknown formation {formation!r}')
+        positions = self._formations.get(formation)
+        if positions is None:
+            positions = self._formations[formation] = self._layout_formation(
+                formation
+                )
+        return positions
+
+    def _layout_formation(self, formation):
+        """Calculates the positions of every alien in a formation from the
+        screen and alien sizes.
+
+        Args:
+            formation (str): The name of the formation, one of FORMATIONS.
+
+        Returns:
+            list: A list of (x, y) tuples, one for each alien.
+        """
         alien_h = self.settings.alien_h
         alien_w = self.settings.alien_w
         screen_h = self.settings.screen_h
@@ -34,11 +145,11 @@ class AlienFleet:
         # calculate the offsets to center of the fleet
         y_offset, x_offset = self.calculate_offsets(alien_h, alien_w, screen_h, fleet_h, fleet_w)
         
-        # create the rectangular formation of aliens
-        self._create_rectangle_fleet(alien_h, alien_w, fleet_h, fleet_w, y_offset, x_offset)
+        # calculate the rectangular formation of aliens
+        return self._calculate_rectangle_formation(alien_h, alien_w, fleet_h, fleet_w, y_offset, x_offset, formation)
 
-    def _create_rectangle_fleet(self, alien_h, alien_w, fleet_h, fleet_w, y_offset, x_offset):
-        """Creates a rectangular formation of aliens.
+    def _calculate_rectangle_formation(self, alien_h, alien_w, fleet_h, fleet_w, y_offset, x_offset, formation):
+        """Calculates a rectangular formation of aliens.
 
         Args:
             alien_h (int): The height of a single alien.
@@ -47,15 +158,23 @@ class AlienFleet:
             fleet_w (int): The width of the fleet.
             y_offset (int): The vertical offset for the start of the fleet.
             x_offset (int): The horizontal offset for the start of the fleet.
+            formation (str): The name of the formation, one of FORMATIONS.
+
+        Returns:
+            list: A list of (x, y) tuples, one for each alien.
         """
+        positions = []
         for row in range(fleet_w):
             for col in range(fleet_h):
                 current_y = alien_h * col + y_offset
                 current_x = alien_w * row + x_offset
-                if col % 2 == 0 or row % 2 == 0:
+                if formation == 'checker' and (col % 2 == 0 or row % 2 == 0):
+                    continue
+                if formation == 'columns' and row % 2 == 0:
                     continue
-                # create alien at the calculated position
-                self._create_alien(current_x, current_y)
+                # store the alien's calculated position
+                positions.append((current_x, current_y))
+        return positions
 
     def calculate_offsets(self, alien_h, alien_w, screen_h, fleet_h, fleet_w):
         """Calculates the vertical and horizontal offsets to center the fleet.
@@ -163,7 +282,10 @@ class AlienFleet:
             sprites in 'other_group' that they collided with. Returns an empty
             dictionary if no collisions occur.
         """
-        return pygame.sprite.groupcollide(self.fleet, other_group, True, True)
+        collisions = pygame.sprite.groupcollide(self.fleet, other_group, True, True)
+        if collisions:
+            self.game.telemetry.emit('hit', len(collisions))
+        return collisions
     
     def check_fleet_bottom(self):
         """Checks if any alien in the fleet has reached the bottom edge of the screen.
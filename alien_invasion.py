@@ -1,3 +1,5 @@
+import argparse
+import os
 import sys
 import pygame
 from settings import Settings
@@ -5,30 +7,73 @@ from game_stats import GameStats
 from ship import Ship
 from arsenal import Arsenal
 from alien_fleet import AlienFleet
+from enemy_arsenal import EnemyArsenal
 from time import sleep
 from button import Button
 from hud import HUD
+from level_prefetcher import LevelPrefetcher
+from input_handler import InputHandler
+from renderer import Renderer
+from particles import ParticleSystem
+from atlas import build_game_atlas
+from telemetry import Telemetry
+from memory_budget import MemoryTracker
+from capture import FrameCapture
+from starfield import Starfield
+from time import perf_counter
+
+class NullSound:
+    """A silent stand-in for pygame.mixer.Sound when audio is disabled."""
+
+    def play(self):
+        pass
+
+    def fadeout(self, time):
+        pass
+
+    def set_volume(self, value):
+        pass
 
 class AlienInvasion:
     """Class to manage game assets and behavior."""
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
-        self.settings = Settings()
+    def __init__(self, settings=None):
+        """Initialize the game, and create game resources.
+
+        Args:
+            settings (Settings, optional): The settings to run with. Defaults
+                to a new Settings instance.
+        """
+        self.settings = settings if settings is not None else Settings()
         self.settings.initialize_dynamic_settings()
+        # stream gameplay and performance events to a file when enabled
+        self.telemetry = Telemetry(self)
+        self.telemetry.start()
+        # sample memory at every level boundary when enabled
+        self.memory_tracker = MemoryTracker(self)
+        self.memory_tracker.start()
+        if self.settings.headless:
+            # run without a window or sound device
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+            # leave SIGINT and SIGTERM alone so worker processes can be stopped
+            os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+        pygame.init()
         
-        # set the display window size
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_w, self.settings.screen_h)
-            )
+        # create the window and the internal resolution render target
+        self.renderer = Renderer(self)
+        self.screen = self.renderer.target
+        # record frames for a worker process to encode when enabled
+        self.capture = FrameCapture(self)
+        self.capture.start()
         # set the title of the game window
         pygame.display.set_caption(self.settings.name)
 
-        # load the background image and scale it to the screen size
-        self.bg = pygame.image.load(self.settings.bg_file)
-        self.bg = pygame.transform.scale(self.bg,
-            (self.settings.screen_w, self.settings.screen_h)
-            )
+        # pack every game image into a single texture atlas
+        self.atlas = build_game_atlas(self.settings, self.renderer.render_size)
+        # keep an opaque display-format copy of the background for fast blits
+        self.bg = self.atlas.get('background').convert()
+        # scroll the background and star layers behind the game
+        self.starfield = Starfield(self)
         # create an instance to store game statistics
         self.game_stats = GameStats(self)
         # create an instance for the Heads-Up Display
@@ -38,14 +83,12 @@ class AlienInvasion:
         # pygame clock to control the frame rate
         self.clock = pygame.time.Clock()
 
-        # initialize the mixer module for sound
-        pygame.mixer.init()
         # load the laser sound effect
-        self.laser_sound = pygame.mixer.Sound(self.settings.laser_sound)
+        self.laser_sound = self._load_sound(self.settings.laser_sound)
         # set the volume of the laser sound
         self.laser_sound.set_volume(0.7)
         # load the impact sound effect
-        self.impact_sound = pygame.mixer.Sound(self.settings.impact_sound)
+        self.impact_sound = self._load_sound(self.settings.impact_sound)
         # set the volume of the impact sound
         self.impact_sound.set_volume(0.7)
 
@@ -54,34 +97,77 @@ class AlienInvasion:
         # create the alien fleet
         self.alien_fleet = AlienFleet(self)
         self.alien_fleet.create_fleet()
+        # the pool of projectiles the aliens fire back with
+        self.enemy_arsenal = EnemyArsenal(self)
+        # hit explosions and muzzle flashes
+        self.particles = ParticleSystem(self)
+        # prepares the next level in the background during play
+        self.level_prefetcher = LevelPrefetcher(self)
         
         # create the play button
         self.play_button = Button(self, 'Play')
         # flag to indicate if the game is currently active
         self.game_active = False
+        # filter the event queue and poll the keyboard
+        self.input = InputHandler(self)
+
+    def _load_sound(self, path):
+        """Load a sound effect, or a silent stand-in when audio is disabled.
+
+        Args:
+            path (Path): The sound file to load.
+
+        Returns:
+            pygame.mixer.Sound | NullSound: The sound effect.
+        """
+        if not self.settings.audio_enabled:
+            return NullSound()
+        # initialize the mixer module for sound
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return pygame.mixer.Sound(path)
 
     def run_game(self):
         """Start the main game loop."""
         while self.running:
+            frame_start = perf_counter()
             # check for user input and events
             self._check_events()
             if self.game_active:
-                # update the ship's position
-                self.ship.update()
-                # update the fleet's position
-                self.alien_fleet.update_fleet()
-                # check for collisions
-                self._check_collisions()
+                # advance the game by one frame
+                self.step()
             # update the display to show latest changes
             self._update_screen()
+            # hand the frame to the encoder process if capturing
+            self.capture.capture_frame()
+            # record how long the frame's work took
+            self.telemetry.frame_done(perf_counter() - frame_start)
             # limit the frame rate of the game
             self.clock.tick(self.settings.FPS)
 
+    def step(self):
+        """Advance the game simulation by one frame, without input or drawing."""
+        # update the ship's position
+        self.ship.update()
+        # update the fleet's position
+        self.alien_fleet.update_fleet()
+        # fire and move the aliens' projectiles
+        self.enemy_arsenal.update()
+        # move and animate the particle effects
+        self.particles.update()
+        # check for collisions
+        self._check_collisions()
+
     def _check_collisions(self):
         # check for collisions between the ship and any alien in the fleet
         if self.ship.check_collisions(self.alien_fleet.fleet):
            self._check_game_status()
 
+        # check for an alien projectile hitting the ship
+        if self.enemy_arsenal.check_collisions(self.ship.rect):
+            self.ship._center_ship()
+            self._check_game_status()
+
        # check if any aliens has reached the bottom of the screen
         if self.alien_fleet.check_fleet_bottom():
             self._check_game_status()
@@ -93,6 +179,9 @@ class AlienInvasion:
             self.impact_sound.play()
             # fade out the impact sound
             self.impact_sound.fadeout(500)
+            # explode every alien that was hit
+            for alien in collisions:
+                self.particles.explode(alien.rect.center)
             # update the game statistics based on the collisions
             self.game_stats.update(collisions)
             # update the score display on the HUD
@@ -100,12 +189,14 @@ class AlienInvasion:
 
         #check if the entire alien fleet has been destroyed
         if self.alien_fleet.check_destroyed_status():
-            self._reset_level()
-            self.settings.increase_difficulty()
-            # update game stats level
-            self.game_stats.update_level()
-            # update HUD view
-            self.HUD.update_level()
+            # swap in the prefetched fleet, difficulty, level and HUD text
+            self.level_prefetcher.advance()
+            self.telemetry.emit('level_up', self.game_stats.level)
+            transition = self.level_prefetcher.metrics
+            self.telemetry.emit('transition', transition.last_ms,
+                int(transition.last_missed)
+                )
+            self.memory_tracker.level_done()
 
     def _check_game_status(self):
         """Checks the game status and performs actions based on the number of 
@@ -116,13 +207,20 @@ class AlienInvasion:
         if self.game_stats.ships_left > 0:
             # decrement the number of ships left
             self.game_stats.ships_left -= 1
+            self.telemetry.emit('ship_lost', self.game_stats.ships_left,
+                self.game_stats.score
+                )
             # reset the game level
             self._reset_level()
             # pause briefly to allow the player to see consequence
-            sleep(0.5)
+            if not self.settings.headless:
+                sleep(0.5)
         else:
             # set the game to inactive when no ships are left
             self.game_active = False
+            self.telemetry.emit('game_over', self.game_stats.score,
+                self.game_stats.level
+                )
         
     def _reset_level(self):
         """Resets the game level by clearing existing projectiles and aliens,
@@ -130,6 +228,8 @@ class AlienInvasion:
         """
         # remove all existing bullets
         self.ship.arsenal.arsenal.empty()
+        # remove all existing alien projectiles
+        self.enemy_arsenal.empty()
         # remove all existing aliens
         self.alien_fleet.fleet.empty()
         # create a new fleet of aliens
@@ -137,16 +237,21 @@ class AlienInvasion:
 
     def restart_game(self):
         """Reset the game by resetting settings, statistics, and game of elements"""
-        # re-initialize dynamice game settings
-        self.settings.initialize_dynamic_settings()
+        # look up the starting level's settings
+        self.settings.apply_level(self.settings.start_level)
         # reset game statistics
         self.game_stats.reset_stats()
-        # update the score to displat on HUD
+        # update the score and level to display on HUD
         self.HUD.update_scores()
+        self.HUD.update_level()
         # reset the game level
         self._reset_level()
+        # remove any leftover particle effects
+        self.particles.clear()
         # center the player's ship
         self.ship._center_ship()
+        # start preparing the next level in the background
+        self.level_prefetcher.start()
         # set the game to active
         self.game_active = True
         # hide the mouse cursor
@@ -154,12 +259,16 @@ class AlienInvasion:
 
     def _update_screen(self):
         """Update the images on the screen and flip to new screen."""
-        # draw the background 
-        self.screen.blit(self.bg, (0,0))
+        # scroll and draw the starfield background
+        self.starfield.update()
+        self.starfield.draw()
         # draw the ship
         self.ship.draw()
-        # draw the alien fleet
+        # draw the alien fleet and its projectiles
         self.alien_fleet.draw()
+        self.enemy_arsenal.draw()
+        # draw the particle effects
+        self.particles.draw()
         # draw the Heads-Up Display
         self.HUD.draw()
 
@@ -169,76 +278,64 @@ class AlienInvasion:
             # make the mouse cursor visible
             pygame.mouse.set_visible(True)
 
-        # make most recent screen draw visible
-        pygame.display.flip()
+        # scale the scene to the window and make it visible
+        self.renderer.present()
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
-            # set the running flag to False to exit the game loop
-            if event.type == pygame.QUIT:
-                # save the high scores before quitting
-                self.running = False
-                # save the high scores before quitting
-                self.game_stats.save_scores()
-                # uninitialize all pygame modules
-                pygame.quit()
-                # exit the game
-                sys.exit()
-            elif event.type == pygame.KEYDOWN and self.game_active == True:
-                # check for key presses if the game is active
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                # check for key releases
-                self._check_keyup_events(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # check for mouse button clicks
-                self._check_button_clicked()
+        self.input.check_events()
 
     def _check_button_clicked(self):
         """Check if the play button was clicked."""
         # get the current position of the mouse
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.renderer.window_to_gameplay(pygame.mouse.get_pos())
         # check if the mouse click is within the bounds of the play button
         if self.play_button.check_clicked(mouse_pos):
             # start a new game if the play button is clicked
             self.restart_game()
-    
-    def _check_keyup_events(self, event):
-        """Respond to key releases."""
-        if event.key == pygame.K_DOWN:
-            # stop if moving down when the down arrow key is released
-            self.ship.moving_down = False
-        elif event.key == pygame.K_UP:
-            # stop moving up when the up arrow key is released
-            self.ship.moving_up = False
-        
-    def _check_keydown_events(self, event):
-        """Respond to key presses."""
-        if event.key == pygame.K_DOWN:
-            # start moving down when the down arrow key is pressed
-            self.ship.moving_down = True
-        elif event.key == pygame.K_UP:
-            # start moving up when the up arrow key is pressed
-            self.ship.moving_up = True
-        elif event.key == pygame.K_SPACE:
-            # fire a bullet and play laser sound if possible
-            if self.ship.fire():
-                self.laser_sound.play()
-                # fade out the laser sound
-                self.laser_sound.fadeout(250)
-        elif event.key == pygame.K_q:
-            # quit game if the 'q' key is pressed
-            self.running = False
-            # save the high scores before quitting
-            self.game_stats.save_scores()
-            # uninitialize all pygame modules
-            pygame.quit()
-            # exit the system
-            sys.exit()
+
+    def fire_bullet(self):
+        """Fire a bullet and play the laser sound if possible.
+
+        Returns:
+            bool: True if a bullet was fired, False otherwise.
+        """
+        if self.ship.fire():
+            # flash at the muzzle
+            self.particles.flash(self.ship.rect.midright)
+            self.laser_sound.play()
+            # fade out the laser sound
+            self.laser_sound.fadeout(250)
+            return True
+        return False
+
+    def quit_game(self):
+        """Save the high scores and exit the game."""
+        # set the running flag to False to exit the game loop
+        self.running = False
+        # save the high scores before quitting
+        self.game_stats.save_scores()
+        # write out any remaining telemetry
+        self.telemetry.close()
+        self.memory_tracker.stop()
+        # finish encoding any captured frames
+        self.capture.stop()
+        # uninitialize all pygame modules
+        pygame.quit()
+        # exit the system
+        sys.exit()
             
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=Settings().name)
+    parser.add_argument('--profile',
+        default=os.environ.get('ALIEN_INVASION_PROFILE'),
+        help='settings profile name or .toml/.json file, e.g. kiosk-low '
+            '(default: $ALIEN_INVASION_PROFILE)')
+    args = parser.parse_args()
+    settings = Settings()
+    if args.profile:
+        settings.apply_profile(args.profile)
     # create an instance of the AlienInvasion Game
-    ai = AlienInvasion()
+    ai = AlienInvasion(settings)
     # run the main game loop
     ai.run_game()
@@ -18,8 +18,20 @@ class Arsenal:
         """
         self.game = game
         self.settings = game.settings
+        # the ship that fires this arsenal's bullets, set by the ship
+        self.ship = None
         # create and empty group to store bullets
         self.arsenal = pygame.sprite.Group()
+        # load the bullet image once so every bullet can share it
+        self.bullet_image = self.load_bullet_image()
+
+    def load_bullet_image(self):
+        """Get the scaled and rotated bullet image from the texture atlas.
+
+        Returns:
+            pygame.Surface: The bullet image ready to be shared by the bullets.
+        """
+        return self.game.atlas.get('bullet')
 
     def update_aresenal(self):
         """Update the position of each bullet in the arsenal and remove
@@ -50,8 +62,16 @@ class Arsenal:
         # check if the number of bullets is less than the allowed amount.
         if len(self.arsenal) < self.settings.bullet_amount:
             # create a new bullet object
-            new_bullet = Bullet(self.game)
+            new_bullet = self.create_bullet()
             # add the new bullet to the arsenal group.
             self.arsenal.add(new_bullet)
             return True
         return False
+
+    def create_bullet(self):
+        """Create a new bullet at the ship's position without firing it.
+
+        Returns:
+            Bullet: The new bullet.
+        """
+        return Bullet(self.game, self.bullet_image, self.ship)
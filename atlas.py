@@ -0,0 +1,299 @@
+import json
+import os
+import pygame
+from pathlib import Path
+
+
+class TextureAtlas:
+    """Packs many images into one surface and hands out subsurfaces of it."""
+
+    def __init__(self, width=2048, padding=1):
+        """Initialize an empty atlas.
+
+        Args:
+            width (int): The minimum width of the packed surface. The atlas
+                grows wider if a single image needs it.
+            padding (int): Transparent pixels left between packed images.
+        """
+        self.width = width
+        self.padding = padding
+        self.surface = None
+        # lists of subsurfaces and of their areas in the atlas, keyed by name
+        self.frames = {}
+        self.areas = {}
+        self._pending = {}
+
+    def add(self, name, image):
+        """Queue a single image for packing.
+
+        Args:
+            name (str): The name to look the image up by.
+            image (pygame.Surface): The image.
+        """
+        self.add_frames(name, [image])
+
+    def add_frames(self, name, images):
+        """Queue the frames of an animation for packing.
+
+        Args:
+            name (str): The name to look the frames up by.
+            images (list): The frames, in playback order.
+        """
+        self._pending[name] = list(images)
+
+    def build(self):
+        """Pack every queued image into the atlas surface.
+
+        Images are packed in shelves, tallest first, which wastes little
+        space for sprites of similar heights.
+        """
+        items = [
+            (name, index, image)
+            for name, images in self._pending.items()
+            for index, image in enumerate(images)
+            ]
+        items.sort(key=lambda item: item[2].get_height(), reverse=True)
+        width = max(
+            [self.width] + [image.get_width() for _, _, image in items]
+            )
+
+        # place the images shelf by shelf
+        placed = {}
+        x = y = shelf_h = 0
+        for name, index, image in items:
+            w, h = image.get_size()
+            if x + w > width:
+                x = 0
+                y += shelf_h + self.padding
+                shelf_h = 0
+            placed[(name, index)] = pygame.Rect(x, y, w, h)
+            x += w + self.padding
+            shelf_h = max(shelf_h, h)
+
+        self.surface = pygame.Surface((width, max(1, y + shelf_h)),
+            pygame.SRCALPHA
+            )
+        for name, index, image in items:
+            self.surface.blit(image, placed[(name, index)])
+
+        areas = {
+            name: [placed[(name, index)] for index in range(len(images))]
+            for name, images in self._pending.items()
+            }
+        self._pending = {}
+        self._set_areas(areas)
+
+    def _set_areas(self, areas):
+        """Create the subsurfaces for packed areas of the atlas surface.
+
+        Args:
+            areas (dict): Lists of pygame.Rect areas keyed by name.
+        """
+        self.areas = areas
+        self.frames = {
+            name: [self.surface.subsurface(rect) for rect in rects]
+            for name, rects in areas.items()
+            }
+
+    def get(self, name, index=0):
+        """Return a packed image.
+
+        Args:
+            name (str): The name the image was added under.
+            index (int): The animation frame, for images added with add_frames().
+
+        Returns:
+            pygame.Surface: A subsurface of the atlas.
+        """
+        return self.frames[name][index]
+
+    def get_frames(self, name):
+        """Return every frame of a packed animation.
+
+        Args:
+            name (str): The name the frames were added under.
+
+        Returns:
+            list: Subsurfaces of the atlas, in playback order.
+        """
+        return self.frames[name]
+
+    def area(self, name, index=0):
+        """Return the area of a packed image, for area-blits from self.surface.
+
+        Args:
+            name (str): The name the image was added under.
+            index (int): The animation frame.
+
+        Returns:
+            pygame.Rect: The image's area in the atlas surface.
+        """
+        return self.areas[name][index]
+
+    def save(self, image_path, index_path, key):
+        """Write the packed atlas to disk so later runs can skip packing.
+
+        Args:
+            image_path (Path): Where to write the atlas PNG.
+            index_path (Path): Where to write the JSON lookup table.
+            key (object): JSON-serializable description of what was packed,
+                used to tell whether the saved atlas is still current.
+        """
+        # write to temporary files first so a reader never sees half a file
+        tmp = f'.{os.getpid()}.tmp'
+        image_tmp = image_path.with_suffix(tmp + image_path.suffix)
+        index_tmp = index_path.with_suffix(tmp + index_path.suffix)
+        pygame.image.save(self.surface, str(image_tmp))
+        index = {
+            'key': key,
+            'areas': {
+                name: [list(rect) for rect in rects]
+                for name, rects in self.areas.items()
+                },
+            }
+        index_tmp.write_text(json.dumps(index))
+        image_tmp.replace(image_path)
+        index_tmp.replace(index_path)
+
+    @classmethod
+    def load(cls, image_path, index_path, key):
+        """Load an atlas written by save().
+
+        Args:
+            image_path (Path): The atlas PNG.
+            index_path (Path): The JSON lookup table.
+            key (object): The key the atlas must have been saved with.
+
+        Returns:
+            TextureAtlas | None: The atlas, or None if there is no saved atlas
+            or it was saved for a different key.
+        """
+        if not image_path.exists() or not index_path.exists():
+            return None
+        try:
+            index = json.loads(index_path.read_text())
+        except ValueError:
+            return None
+        if index.get('key') != key:
+            return None
+        atlas = cls()
+        try:
+            atlas.surface = pygame.image.load(str(image_path)).convert_alpha()
+        except pygame.error:
+            return None
+        atlas._set_areas({
+            name: [pygame.Rect(rect) for rect in rects]
+            for name, rects in index['areas'].items()
+            })
+        return atlas
+
+
+def game_atlas_specs(settings, render_size):
+    """Describe every image the game packs into its atlas.
+
+    Args:
+        settings (Settings): The game settings.
+        render_size (tuple): The size of the render target, for the background.
+
+    Returns:
+        list: One dict per atlas entry with the source 'file' and optional
+        'areas' to cut out, 'size' to scale to, 'rotate' angle and 'scales'
+        to make extra frames from.
+    """
+    return [
+        {'name': 'background', 'file': settings.bg_file, 'size': render_size},
+        {'name': 'ship', 'file': settings.ship_file,
+            'size': (settings.ship_w, settings.ship_h),
+            'rotate': settings.ship_rotate},
+        {'name': 'life', 'file': settings.ship_file,
+            'size': (settings.ship_w, settings.ship_h)},
+        {'name': 'bullet', 'file': settings.bullet_file,
+            'size': (settings.bullet_w, settings.bullet_h),
+            'rotate': settings.bullet_rotate},
+        {'name': 'alien', 'file': settings.alien_file,
+            'size': (settings.alien_w, settings.alien_h),
+            'rotate': settings.alien_rotate},
+        {'name': 'enemy_projectile', 'file': settings.enemy_projectile_file,
+            'size': (settings.enemy_projectile_w, settings.enemy_projectile_h),
+            'rotate': settings.alien_rotate},
+        {'name': 'explosion', 'file': settings.particle_file,
+            'areas': settings.particle_frames},
+        {'name': 'flash', 'file': settings.flash_file,
+            'size': settings.flash_size, 'rotate': settings.bullet_rotate,
+            'scales': (1, 0.75, 0.5)},
+        ] + [
+        # extra animations, e.g. for new enemy types
+        dict(spec) for spec in settings.atlas_animations
+        ]
+
+
+def _make_frames(spec, source):
+    """Cut, scale and rotate the frames of one atlas entry.
+
+    Args:
+        spec (dict): The entry, as returned by game_atlas_specs().
+        source (pygame.Surface): The decoded source image.
+
+    Returns:
+        list: The finished frames.
+    """
+    if 'areas' in spec:
+        frames = [source.subsurface(area) for area in spec['areas']]
+    else:
+        frames = [source]
+    if 'size' in spec:
+        frames = [pygame.transform.scale(frame, spec['size']) for frame in frames]
+    if 'rotate' in spec:
+        frames = [pygame.transform.rotate(frame, spec['rotate']) for frame in frames]
+    if 'scales' in spec:
+        frames = [
+            pygame.transform.smoothscale_by(frame, scale)
+            for frame in frames
+            for scale in spec['scales']
+            ]
+    return frames
+
+
+def build_game_atlas(settings, render_size):
+    """Pack the game's images into one atlas, or load it if already packed.
+
+    Each source file is decoded once. When Settings.atlas_cache is on the
+    packed atlas is saved, and later runs with the same images and settings
+    load it with a single decode.
+
+    Args:
+        settings (Settings): The game settings.
+        render_size (tuple): The size of the render target.
+
+    Returns:
+        TextureAtlas: The packed atlas.
+    """
+    specs = game_atlas_specs(settings, render_size)
+    files = sorted({Path(spec['file']) for spec in specs})
+    # describes exactly what was packed, so a stale atlas is never loaded
+    key = json.loads(json.dumps({
+        'specs': [{**spec, 'file': str(spec['file'])} for spec in specs],
+        'mtimes': {str(path): path.stat().st_mtime for path in files},
+        }))
+
+    if settings.atlas_cache:
+        atlas = TextureAtlas.load(settings.atlas_file,
+            settings.atlas_index_file, key
+            )
+        if atlas is not None:
+            return atlas
+
+    sources = {path: pygame.image.load(path).convert_alpha() for path in files}
+    atlas = TextureAtlas(settings.atlas_width)
+    for spec in specs:
+        atlas.add_frames(spec['name'],
+            _make_frames(spec, sources[Path(spec['file'])])
+            )
+    atlas.build()
+
+    if settings.atlas_cache:
+        try:
+            atlas.save(settings.atlas_file, settings.atlas_index_file, key)
+        except (OSError, pygame.error) as e:
+            print(f'Could not save texture atlas: {e}')
+    return atlas
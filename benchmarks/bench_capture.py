@@ -0,0 +1,80 @@
+"""Measure the frame time cost of capturing gameplay.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_capture
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from alien_invasion import AlienInvasion
+from capture import CaptureMetrics
+from settings import Settings
+
+FRAMES = 300
+# frames played before measuring, while the encoder process starts up
+WARMUP_FRAMES = 60
+# (label, enabled, format, every Nth frame, scale)
+CONFIGS = (
+    ('off', False, 'png', 1, 1.0),
+    ('png', True, 'png', 1, 1.0),
+    ('png every 4th, half size', True, 'png', 4, 0.5),
+    ('raw', True, 'raw', 1, 1.0),
+    ('raw half size', True, 'raw', 1, 0.5),
+)
+
+
+def run(directory, enabled, fmt, every, scale):
+    """Play and draw a number of frames at the game's frame rate while
+    capturing them.
+
+    Args:
+        directory (Path): Where captures are written.
+        enabled (bool): Whether capture is on.
+        fmt (str): The capture format.
+        every (int): Capture every Nth frame.
+        scale (float): The captured frame size relative to the render target.
+
+    Returns:
+        tuple: The mean and worst frame times in ms, and the FrameCapture.
+    """
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.capture_enabled = enabled
+    settings.capture_format = fmt
+    settings.capture_every = every
+    settings.capture_scale = scale
+    settings.capture_dir = directory
+    game = AlienInvasion(settings)
+    game.restart_game()
+    times = []
+    for frame in range(WARMUP_FRAMES + FRAMES):
+        if frame == WARMUP_FRAMES:
+            game.capture.metrics = CaptureMetrics()
+        start = perf_counter()
+        game.step()
+        game._update_screen()
+        game.capture.capture_frame()
+        if frame >= WARMUP_FRAMES:
+            times.append((perf_counter() - start) * 1000)
+        # leave the rest of the frame to the encoder, like the game loop
+        game.clock.tick(settings.FPS)
+    game.capture.stop()
+    return sum(times) / len(times), max(times), game.capture
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        for label, enabled, fmt, every, scale in CONFIGS:
+            mean, worst, capture = run(Path(directory), enabled, fmt, every,
+                scale
+                )
+            print(f'{label:>26}: frame mean {mean:.3f} ms, worst {worst:.3f} ms'
+                + (f', {capture.metrics}, written: {capture.written}'
+                    if enabled else ''))
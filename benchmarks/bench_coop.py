@@ -0,0 +1,49 @@
+"""Measure server tick time and bandwidth for loopback co-op games.
+
+Runs an authoritative server and several bot clients on localhost:
+
+    python -m benchmarks.bench_coop
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import asyncio
+from coop_client import BotPilot, CoopClient
+from coop_server import CoopServer
+
+SECONDS = 5
+CLIENT_COUNTS = (1, 2, 4)
+
+
+async def run(clients):
+    """Play a loopback game with a number of bot clients.
+
+    Args:
+        clients (int): How many clients to connect.
+
+    Returns:
+        tuple: The server's metrics and every client's metrics.
+    """
+    server = CoopServer()
+    port = await server.start('127.0.0.1', 0)
+    bots = [CoopClient(BotPilot(seed)) for seed in range(clients)]
+    for bot in bots:
+        await bot.connect('127.0.0.1', port)
+    # measure only the ticks with every client connected
+    server.metrics.reset()
+    server_task = asyncio.create_task(server.run(SECONDS))
+    await asyncio.gather(*(bot.run(SECONDS) for bot in bots))
+    await server_task
+    await server.stop()
+    return server.metrics, [bot.metrics for bot in bots]
+
+
+if __name__ == '__main__':
+    for clients in CLIENT_COUNTS:
+        server_metrics, client_metrics = asyncio.run(run(clients))
+        rate = server_metrics.bytes / SECONDS / 1024
+        print(f'{clients} client(s): {server_metrics}, {rate:.1f} KiB/s')
+        for i, metrics in enumerate(client_metrics):
+            print(f'  client {i}: {metrics}')
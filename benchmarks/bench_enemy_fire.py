@@ -0,0 +1,133 @@
+"""Measure the cost of alien return fire with a dense fleet.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_enemy_fire
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from time import perf_counter
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+FRAMES = 600
+
+
+def dense_settings(enemy_fire):
+    """Create settings for a headless game with a very dense fleet.
+
+    Args:
+        enemy_fire (bool): Whether the aliens fire back.
+
+    Returns:
+        Settings: The settings.
+    """
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.telemetry_enabled = False
+    settings.atlas_cache = False
+    # small aliens packed into a solid block make the largest fleet
+    settings.alien_w = 12
+    settings.alien_h = 12
+    settings.formations = ('block',)
+    settings.enemy_fire_enabled = enemy_fire
+    # fire as often as possible, so the pool stays full
+    settings.enemy_fire_interval = 1
+    settings.apply_overrides({})
+    return settings
+
+
+def run(enemy_fire):
+    """Step a dense game for a number of frames.
+
+    Args:
+        enemy_fire (bool): Whether the aliens fire back.
+
+    Returns:
+        tuple: The number of aliens, the step times in ms of ordinary frames
+        and the step times of frames where the ship was lost.
+    """
+    game = AlienInvasion(dense_settings(enemy_fire))
+    game.restart_game()
+    aliens = len(game.alien_fleet.fleet)
+    # keep the ship alive so every frame is measured
+    game.game_stats.ships_left = FRAMES
+    times = []
+    lost = []
+    for _ in range(FRAMES):
+        ships_left = game.game_stats.ships_left
+        start = perf_counter()
+        game.step()
+        elapsed = (perf_counter() - start) * 1000
+        # losing the ship rebuilds the whole fleet, time those separately
+        if game.game_stats.ships_left != ships_left:
+            lost.append(elapsed)
+        else:
+            times.append(elapsed)
+    return aliens, times, lost
+
+
+def describe(times):
+    """Summarize step times.
+
+    Args:
+        times (list): Step times in ms.
+
+    Returns:
+        str: The mean, 99th percentile and worst time.
+    """
+    if not times:
+        return 'none'
+    ordered = sorted(times)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f'mean {sum(ordered) / len(ordered):.3f} ms, p99 {p99:.3f} ms, '
+        f'worst {ordered[-1]:.3f} ms')
+
+
+def time_shooter_selection(game, repeats=2000):
+    """Compare the lane index with scanning every alien for the front ones.
+
+    Args:
+        game (AlienInvasion): A game with its fleet created.
+        repeats (int): How many selections to time.
+
+    Returns:
+        tuple: The mean time in microseconds of the lane index and of a scan.
+    """
+    fleet = game.alien_fleet
+
+    def scan():
+        fronts = {}
+        for alien in fleet.fleet:
+            front = fronts.get(alien.rect.y)
+            if front is None or alien.x < front.x:
+                fronts[alien.rect.y] = alien
+        return list(fronts.values())
+
+    results = []
+    for select in (fleet.front_aliens, scan):
+        start = perf_counter()
+        for _ in range(repeats):
+            select()
+        results.append((perf_counter() - start) / repeats * 1e6)
+    return tuple(results)
+
+
+if __name__ == '__main__':
+    budget = 1000 / Settings().FPS
+    print(f'frame budget {budget:.1f} ms')
+    for enemy_fire in (False, True):
+        aliens, times, lost = run(enemy_fire)
+        label = 'enemy fire on ' if enemy_fire else 'enemy fire off'
+        print(f'{label}: {aliens} aliens, step {describe(times)}')
+        print(f'  {len(lost)} frames losing the ship: {describe(lost)}')
+
+    game = AlienInvasion(dense_settings(True))
+    game.restart_game()
+    indexed, scanned = time_shooter_selection(game)
+    print(f'shooter selection: lane index {indexed:.1f} us, '
+        f'full scan {scanned:.1f} us')
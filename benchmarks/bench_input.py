@@ -0,0 +1,54 @@
+"""Measure event handling time under heavy mouse input.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_input
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from alien_invasion import AlienInvasion
+
+TICKS = 600
+MOTION_EVENTS_PER_TICK = 200
+
+
+def flood_mouse_motion():
+    """Post a burst of mouse motion events, like a fast-moving mouse."""
+    for i in range(MOTION_EVENTS_PER_TICK):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION,
+            pos=(i, i), rel=(1, 1), buttons=(0, 0, 0)
+            ))
+
+
+def run(game, filtered):
+    """Run the input handler for a number of ticks under mouse flooding.
+
+    Args:
+        game (AlienInvasion): The game whose input handler is measured.
+        filtered (bool): Whether unhandled event types are blocked.
+
+    Returns:
+        InputMetrics: The recorded event handling metrics.
+    """
+    if filtered:
+        game.input.filter_events()
+    else:
+        pygame.event.set_allowed(None)
+    pygame.event.clear()
+    game.input.metrics.reset()
+    for _ in range(TICKS):
+        flood_mouse_motion()
+        game.input.check_events()
+    return game.input.metrics
+
+
+if __name__ == '__main__':
+    game = AlienInvasion()
+    game.restart_game()
+    print(f'{MOTION_EVENTS_PER_TICK} mouse motion events per tick, {TICKS} ticks')
+    print(f'unfiltered: {run(game, filtered=False)}')
+    print(f'filtered:   {run(game, filtered=True)}')
@@ -0,0 +1,79 @@
+"""Measure the cost of drawing the starfield against a static background.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_starfield
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from time import perf_counter
+from alien_invasion import AlienInvasion
+from settings import Settings
+from starfield import Starfield
+
+FRAMES = 600
+LAYER_COUNTS = (0, 1, 3, 6, 12)
+
+
+def time_frames(draw):
+    """Time a drawing function over a number of frames.
+
+    Args:
+        draw (callable): Draws one frame.
+
+    Returns:
+        float: The mean time per frame in milliseconds.
+    """
+    start = perf_counter()
+    for _ in range(FRAMES):
+        draw()
+    return (perf_counter() - start) / FRAMES * 1000
+
+
+def starfield_with_layers(game, count):
+    """Create a starfield with a number of star layers.
+
+    Args:
+        game (AlienInvasion): The game to draw to.
+        count (int): How many star layers to use.
+
+    Returns:
+        Starfield: The starfield.
+    """
+    layers = game.settings.starfield_layers
+    game.settings.starfield_layers = [
+        layers[i % len(layers)] for i in range(count)
+        ]
+    starfield = Starfield(game)
+    game.settings.starfield_layers = layers
+    return starfield
+
+
+if __name__ == '__main__':
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    game = AlienInvasion(settings)
+    screen = game.screen
+
+    def static():
+        screen.blit(game.bg, (0, 0))
+
+    def fill():
+        screen.fill((0, 0, 0))
+
+    print(f'full-screen fill:   {time_frames(fill):.3f} ms')
+    print(f'static background:  {time_frames(static):.3f} ms')
+    for count in LAYER_COUNTS:
+        starfield = starfield_with_layers(game, count)
+
+        def scroll():
+            starfield.update()
+            starfield.draw()
+
+        strips = sum(len(layer.strips) for layer in starfield.layers[1:])
+        print(f'starfield, {count:>2} star layers ({strips:>3} strips): '
+            f'{time_frames(scroll):.3f} ms')
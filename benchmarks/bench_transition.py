@@ -0,0 +1,79 @@
+"""Measure level transition frames with and without prefetching.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transition
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from time import perf_counter
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+LEVELS = 30
+# frames played between transitions, long enough for the prefetch to finish
+FRAMES_PER_LEVEL = 20
+
+
+def dense_settings():
+    """Create settings for a headless game with a large fleet to build.
+
+    Returns:
+        Settings: The settings.
+    """
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.telemetry_enabled = False
+    settings.atlas_cache = False
+    settings.alien_w = 20
+    settings.alien_h = 20
+    settings.formations = ('block',)
+    settings.apply_overrides({})
+    return settings
+
+
+def run(game, prefetch):
+    """Play a number of levels and time every transition frame.
+
+    Args:
+        game (AlienInvasion): The game to play.
+        prefetch (bool): Whether the next level is prepared in the
+            background. Otherwise it is built on the transition frame, like
+            the game did before prefetching.
+
+    Returns:
+        list: The step time of every transition frame in ms.
+    """
+    game.restart_game()
+    prefetcher = game.level_prefetcher
+    prefetcher.metrics.reset()
+    times = []
+    for _ in range(LEVELS):
+        for _ in range(FRAMES_PER_LEVEL):
+            game.step()
+        # never run out of ships
+        game.game_stats.ships_left = game.settings.staring_ship_count
+        if not prefetch:
+            # forget the prepared level, so the transition builds it
+            prefetcher._join()
+            prefetcher._prepared = None
+        game.alien_fleet.fleet.empty()
+        start = perf_counter()
+        game.step()
+        times.append((perf_counter() - start) * 1000)
+    return times
+
+
+if __name__ == '__main__':
+    game = AlienInvasion(dense_settings())
+    print(f'{len(game.alien_fleet.calculate_formation("block"))} aliens per level')
+    for prefetch in (False, True):
+        times = run(game, prefetch)
+        label = 'prefetched' if prefetch else 'built inline'
+        print(f'{label}: transition frame mean {sum(times) / len(times):.3f} ms, '
+            f'worst {max(times):.3f} ms')
+        print(f'  swap only: {game.level_prefetcher.metrics}')
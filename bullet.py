@@ -1,34 +1,35 @@
-import pygame
 from pygame.sprite import Sprite
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from alien_invasion import AlienInvasion
+    from ship import Ship
 
 class Bullet(Sprite):
     """A class to manage bullets fired from the ship."""
 
-    def __init__(self, game: 'AlienInvasion'):
+    def __init__(self, game: 'AlienInvasion', image, ship: 'Ship' = None):
         """Create a bullet object at the ship's current position.
 
         Args:
             game (AlienInvasion): An instance of the AlienInvasion game class.
             This provides access to game resources like settings.
+            image (pygame.Surface): The arsenal's scaled and rotated bullet image.
+            ship (Ship, optional): The ship firing the bullet. Defaults to the
+            game's ship.
         """
         super().__init__()
-        self.screen = game.screen
+        self.renderer = game.renderer
         self.settings = game.settings
 
-        # load the bullet image, scale and rotate it
-        self.image = pygame.image.load(self.settings.bullet_file)
-        self.image = pygame.transform.scale(self.image, 
-            (self.settings.bullet_w, self.settings.bullet_h)
-            )
-        self.image = pygame.transform.rotate(self.image, self.settings.bullet_rotate)
+        # share the arsenal's bullet image
+        self.image = image
 
         # create the bullets rect object and position it at the ships middle-right
         self.rect = self.image.get_rect()
-        self.rect.midright = game.ship.rect.midright
+        if ship is None:
+            ship = game.ship
+        self.rect.midright = ship.rect.midright
 
         # store the bullet's exact horizontal position as a float for precise movement
         self.x = float(self.rect.x)
@@ -42,4 +43,4 @@ class Bullet(Sprite):
 
     def draw_bullet(self):
         """Draw the bullet to the screen."""
-        self.screen.blit(self.image, self.rect)
+        self.renderer.blit(self.image, self.rect)
@@ -16,8 +16,8 @@ class Button:
             msg (str): The text to be displayed on the button.
         """
         self.game = game
-        self.screen = game.screen
-        self.boundaries = game.screen.get_rect()
+        self.renderer = game.renderer
+        self.boundaries = game.renderer.boundaries
         self.settings = game.settings
         self.font = pygame.font.Font(self.settings.font_file,
             self.settings.button_font_size
@@ -44,9 +44,9 @@ class Button:
     def draw(self):
         """Draw the button to the screen."""
         # fill the button's rectangle with the button color
-        self.screen.fill(self.settings.button_color, self.rect)
+        self.renderer.fill(self.settings.button_color, self.rect)
         # blit the message image onto the screen at its center
-        self.screen.blit(self.msg_image, self.msg_image_rect)
+        self.renderer.blit(self.msg_image, self.msg_image_rect)
 
     def check_clicked(self, mouse_pos):
         """Check if the mouse click position is within the button's boundaries.
@@ -0,0 +1,236 @@
+import json
+import multiprocessing
+import queue
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from time import perf_counter
+import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# the layout of a captured pixel, which ffmpeg calls 'rgb0'
+PIXEL_FORMAT = 'RGBX'
+FORMATS = ('png', 'raw')
+
+
+class CaptureMetrics:
+    """Records how many frames were captured and how long copying took."""
+
+    def __init__(self):
+        """Initialize empty capture metrics."""
+        self.captured = 0
+        self.dropped = 0
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+
+    def record(self, seconds):
+        """Record the copy of a single captured frame.
+
+        Args:
+            seconds (float): How long copying the frame took.
+        """
+        elapsed_ms = seconds * 1000
+        self.captured += 1
+        self.total_ms += elapsed_ms
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+
+    @property
+    def mean_ms(self):
+        """float: The average copy time per captured frame in milliseconds."""
+        return self.total_ms / self.captured if self.captured else 0.0
+
+    def __str__(self):
+        return (f'captured: {self.captured}, dropped: {self.dropped}, '
+            f'copy mean: {self.mean_ms:.3f} ms, worst: {self.worst_ms:.3f} ms')
+
+
+class FrameCapture:
+    """Copies rendered frames into shared memory for a worker process to
+    encode, so encoding never runs on the game loop.
+
+    Frames are copied into a fixed ring of preallocated shared memory
+    buffers. The game loop takes a free buffer, copies the frame straight
+    into it and queues it. The worker writes it to disk and hands the
+    buffer back. When no buffer is free the frame is dropped and counted
+    instead of waiting for the worker.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Initialize capture. Nothing is captured unless it is enabled.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings and the renderer.
+
+        Raises:
+            ValueError: If Settings.capture_format is not a supported format.
+        """
+        self.settings = game.settings
+        self.renderer = game.renderer
+        self.enabled = self.settings.capture_enabled
+        self.format = self.settings.capture_format
+        if self.format not in FORMATS:
+            raise ValueError(f'Unknown capture format {self.format!r}')
+        self.metrics = CaptureMetrics()
+        self.frame = 0
+        self.path = None
+        self._worker = None
+        self._written = None
+        self._scaled = None
+
+        # the captured frame size, optionally smaller than the render target
+        width, height = self.renderer.render_size
+        scale = self.settings.capture_scale
+        self.size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    def start(self):
+        """Allocate the buffers and start the encoder process."""
+        if not self.enabled or self._worker is not None:
+            return
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.path = self.settings.capture_dir / f'capture-{stamp}'
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        frame_bytes = self.size[0] * self.size[1] * len(PIXEL_FORMAT)
+        self._buffers = [
+            shared_memory.SharedMemory(create=True, size=frame_bytes)
+            for _ in range(self.settings.capture_buffers)
+            ]
+        # surfaces whose pixels are the shared memory, so copying a frame
+        # into one writes it straight into the buffer
+        self._surfaces = [
+            pygame.image.frombuffer(buffer.buf[:frame_bytes], self.size,
+                PIXEL_FORMAT
+                )
+            for buffer in self._buffers
+            ]
+        target = self.renderer.target
+        if self.size != target.get_size():
+            # scale() can only write into a surface of the source's pixel
+            # format, so frames are scaled here and then blitted into the
+            # buffers, which converts them to RGBX
+            self._scaled = pygame.Surface(self.size, 0, target)
+        # spawn rather than fork, the game process has SDL threads running
+        context = multiprocessing.get_context('spawn')
+        self._free = context.Queue()
+        self._ready = context.Queue()
+        for index in range(len(self._buffers)):
+            self._free.put(index)
+        self._written = context.Value('i', 0)
+        self._worker = context.Process(target=encode_frames,
+            args=([buffer.name for buffer in self._buffers], self.size,
+                self.format, self.path, self._ready, self._free,
+                self._written
+                ),
+            daemon=True
+            )
+        self._worker.start()
+        self._write_info()
+
+    def _write_info(self):
+        """Describe the capture next to the frames, e.g. for ffmpeg."""
+        info = {
+            'format': self.format,
+            'width': self.size[0],
+            'height': self.size[1],
+            'pixel_format': 'rgb0',
+            'fps': self.settings.FPS / self.settings.capture_every,
+            }
+        (self.path / 'capture.json').write_text(json.dumps(info, indent=4))
+
+    def capture_frame(self):
+        """Copy the frame just drawn, if it is one of the frames captured.
+
+        Never waits for the encoder: if every buffer is still queued, the
+        frame is dropped.
+        """
+        if self._worker is None:
+            return
+        frame = self.frame
+        self.frame += 1
+        if frame % self.settings.capture_every:
+            return
+        start = perf_counter()
+        try:
+            index = self._free.get_nowait()
+        except queue.Empty:
+            self.metrics.dropped += 1
+            return
+        target = self.renderer.target
+        surface = self._surfaces[index]
+        if self._scaled is None:
+            surface.blit(target, (0, 0))
+        else:
+            pygame.transform.scale(target, self.size, self._scaled)
+            surface.blit(self._scaled, (0, 0))
+        self._ready.put_nowait((index, frame))
+        self.metrics.record(perf_counter() - start)
+
+    @property
+    def written(self):
+        """int: The number of frames the encoder has written so far."""
+        return self._written.value if self._written is not None else 0
+
+    def stop(self):
+        """Finish encoding the queued frames and free the buffers."""
+        if self._worker is None:
+            return
+        self._ready.put(None)
+        self._worker.join(self.settings.capture_stop_timeout)
+        if self._worker.is_alive():
+            self._worker.terminate()
+            self._worker.join()
+        self._worker = None
+        # the surfaces hold views of the buffers, release them first
+        self._surfaces = []
+        self._scaled = None
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink()
+        self._buffers = []
+
+
+def encode_frames(names, size, fmt, path, ready, free, written):
+    """Write queued frames to disk until told to stop. Runs in the encoder
+    process.
+
+    Args:
+        names (list): The names of the shared memory buffers.
+        size (tuple): The frame size.
+        fmt (str): 'png' for one PNG per frame or 'raw' for a single stream
+            of raw pixels.
+        path (Path): The directory to write to.
+        ready (multiprocessing.Queue): (buffer index, frame number) of each
+            frame to write, then None to stop.
+        free (multiprocessing.Queue): Receives each buffer index once its
+            frame is written.
+        written (multiprocessing.Value): Counts the frames written.
+    """
+    frame_bytes = size[0] * size[1] * len(PIXEL_FORMAT)
+    buffers = [shared_memory.SharedMemory(name=name) for name in names]
+    stream = open(Path(path) / 'capture.rgb0', 'wb') if fmt == 'raw' else None
+    try:
+        while True:
+            item = ready.get()
+            if item is None:
+                break
+            index, frame = item
+            pixels = buffers[index].buf[:frame_bytes]
+            if stream is not None:
+                stream.write(pixels)
+            else:
+                image = pygame.image.frombuffer(pixels, size, PIXEL_FORMAT)
+                pygame.image.save(image, str(Path(path) / f'frame-{frame:06d}.png'))
+                del image
+            pixels.release()
+            free.put(index)
+            with written.get_lock():
+                written.value += 1
+    finally:
+        if stream is not None:
+            stream.close()
+        for buffer in buffers:
+            buffer.close()
@@ -0,0 +1,359 @@
+"""A co-op client: sends its input to the server and predicts its own ship.
+
+Join a running server with a window and the keyboard:
+
+    python coop_client.py --host 127.0.0.1 --port 50007
+"""
+import argparse
+import asyncio
+import random
+import struct
+from collections import deque
+import coop_protocol as protocol
+from settings import Settings
+
+
+class PredictedShip:
+    """Moves the player's own ship the same way the server does, so it
+    responds to input without waiting a round trip.
+    """
+
+    def __init__(self, top, bottom, height):
+        """Initialize the predicted ship.
+
+        Args:
+            top (int): The top of the play area.
+            bottom (int): The bottom of the play area.
+            height (int): The height of the ship.
+        """
+        self.top = top
+        self.bottom = bottom
+        self.height = height
+        self.speed = 0.0
+        self.y = float((top + bottom - height) // 2)
+
+    def move(self, buttons):
+        """Apply one tick of input, mirroring Ship._update_ship_movement().
+
+        Args:
+            buttons (int): The UP, DOWN and FIRE bits held.
+        """
+        # both limits are checked against the position before moving
+        rect_y = round(self.y)
+        moving_down = buttons & protocol.DOWN
+        moving_up = buttons & protocol.UP
+        if moving_down and rect_y + self.height < self.bottom:
+            self.y += self.speed
+        if moving_up and rect_y > self.top:
+            self.y -= self.speed
+
+
+class ClientMetrics:
+    """Records the states a client received and how well it predicted."""
+
+    def __init__(self):
+        """Initialize empty client metrics."""
+        self.states = 0
+        self.bytes = 0
+        self.keyframes = 0
+        # server corrections to the predicted ship, and their total size
+        self.corrections = 0
+        self.correction_px = 0.0
+
+    def __str__(self):
+        bytes_per_state = self.bytes / self.states if self.states else 0.0
+        return (f'states: {self.states}, {bytes_per_state:.0f} B/state, '
+            f'keyframes: {self.keyframes}, corrections: {self.corrections} '
+            f'({self.correction_px:.1f} px total)')
+
+
+class BotPilot:
+    """Sweeps the ship up and down the screen while firing."""
+
+    def __init__(self, seed=None):
+        """Initialize the pilot.
+
+        Args:
+            seed (int, optional): Seeds the direction the sweep starts in.
+        """
+        self.rng = random.Random(seed)
+        self.moving_up = self.rng.random() < 0.5
+
+    def act(self, client):
+        """Choose the buttons for one tick.
+
+        Args:
+            client (CoopClient): The client being piloted.
+
+        Returns:
+            int: The UP, DOWN and FIRE bits to hold.
+        """
+        ship = client.ship
+        if ship.y <= ship.top:
+            self.moving_up = False
+        elif ship.y + ship.height >= ship.bottom:
+            self.moving_up = True
+        return (protocol.UP if self.moving_up else protocol.DOWN) | protocol.FIRE
+
+
+class CoopClient:
+    """Mirrors the server's game state and controls one ship."""
+
+    def __init__(self, pilot):
+        """Initialize a client that is not connected yet.
+
+        Args:
+            pilot (BotPilot | CoopView): Chooses the buttons each tick.
+        """
+        self.pilot = pilot
+        self.metrics = ClientMetrics()
+        self.player = None
+        self.tick_rate = None
+        self.ship = None
+        self.reader = None
+        self.writer = None
+        # inputs sent but not yet applied by the server, oldest first
+        self.pending = deque()
+        self.seq = 0
+        # the mirrored game state
+        self.layout = []
+        self.alive = []
+        self.offset = (0.0, 0.0)
+        self.ships = {}
+        self.bullets = []
+        self.projectiles = []
+        self.stats = {}
+        self.tick = 0
+
+    async def connect(self, host, port):
+        """Connect to a server and wait for its welcome.
+
+        Args:
+            host (str): The server's address.
+            port (int): The server's port.
+        """
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        welcome = protocol.decode_welcome(await protocol.read_frame(self.reader))
+        self.player = welcome['player']
+        self.tick_rate = welcome['tick_rate']
+        self.ship = PredictedShip(welcome['top'], welcome['bottom'],
+            welcome['ship_h']
+            )
+
+    async def run(self, duration=None):
+        """Send input every tick and apply states as they arrive.
+
+        Args:
+            duration (float, optional): Stop after this many seconds. Runs
+                until the server disconnects if not given.
+        """
+        receiver = asyncio.create_task(self._receive_loop())
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        next_tick = loop.time()
+        end = None if duration is None else next_tick + duration
+        try:
+            while not receiver.done() and (end is None or next_tick < end):
+                buttons = self.pilot.act(self)
+                if buttons is None:
+                    break
+                self.send_input(buttons)
+                await self.writer.drain()
+                next_tick += period
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        finally:
+            receiver.cancel()
+            await protocol.close_writer(self.writer)
+
+    def send_input(self, buttons):
+        """Send one tick of input and apply it to the predicted ship.
+
+        Args:
+            buttons (int): The UP, DOWN and FIRE bits held.
+        """
+        self.seq += 1
+        self.pending.append((self.seq, buttons))
+        self.ship.move(buttons)
+        self.writer.write(protocol.pack_frame(
+            protocol.encode_input(self.seq, buttons)
+            ))
+
+    async def _receive_loop(self):
+        """Apply states from the server until it disconnects."""
+        try:
+            while True:
+                payload = await protocol.read_frame(self.reader)
+                self.metrics.states += 1
+                self.metrics.bytes += protocol.FRAME.size + len(payload)
+                self.apply_state(protocol.decode_state(payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError,
+                struct.error, IndexError):
+            # the server left or sent a frame that isn't a valid state
+            pass
+
+    def apply_state(self, state):
+        """Update the mirrored game from a server state.
+
+        Args:
+            state (dict): A state returned by coop_protocol.decode_state().
+        """
+        self.tick = state['tick']
+        if 'fleet' in state:
+            self.layout, self.alive = state['fleet']
+            self.metrics.keyframes += 1
+        for index in state.get('kills', ()):
+            self.alive[index] = False
+        if 'stats' in state:
+            self.stats = state['stats']
+            self.ship.speed = self.stats['ship_speed']
+        self.offset = state['offset']
+        self.ships = dict(state['ships'])
+        self.bullets = state['bullets']
+        self.projectiles = state['projectiles']
+        self._reconcile(state['ack'])
+
+    def _reconcile(self, ack):
+        """Correct the predicted ship with the server's position.
+
+        Starts from where the server had the ship after the last input it
+        applied and replays the inputs it has not applied yet.
+
+        Args:
+            ack (int): The last input sequence number the server applied.
+        """
+        if self.player not in self.ships:
+            return
+        while self.pending and self.pending[0][0] <= ack:
+            self.pending.popleft()
+        predicted = self.ship.y
+        self.ship.y = self.ships[self.player]
+        for _, buttons in self.pending:
+            self.ship.move(buttons)
+        error = abs(self.ship.y - predicted)
+        if error > 0.01:
+            self.metrics.corrections += 1
+            self.metrics.correction_px += error
+
+    def aliens(self):
+        """Yield the position of every living alien.
+
+        Yields:
+            tuple: An alien's (x, y) position.
+        """
+        dx, dy = self.offset
+        for (x, y), alive in zip(self.layout, self.alive):
+            if alive:
+                yield (x + dx, y + dy)
+
+
+class CoopView:
+    """Draws a client's mirrored game in a window and reads the keyboard."""
+
+    def __init__(self, settings=None):
+        """Open the window and load the game's images.
+
+        Args:
+            settings (Settings, optional): The settings to run with.
+        """
+        # imported here so bots never open a window
+        import pygame
+        from alien_invasion import AlienInvasion
+
+        self.pygame = pygame
+        self.game = AlienInvasion(settings)
+        self.renderer = self.game.renderer
+        atlas = self.game.atlas
+        self.images = {name: atlas.get(name)
+            for name in ('ship', 'alien', 'bullet', 'enemy_projectile')}
+        keys = self.game.input.keys
+        self.keys = ((keys['up'], protocol.UP), (keys['down'], protocol.DOWN),
+            (keys['fire'], protocol.FIRE))
+        self.quit_key = keys['quit']
+        self._stats = None
+
+    def act(self, client):
+        """Read the keyboard, draw the latest state and choose the buttons.
+
+        Args:
+            client (CoopClient): The client being controlled.
+
+        Returns:
+            int | None: The UP, DOWN and FIRE bits held, or None to quit.
+        """
+        pygame = self.pygame
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                    and event.key == self.quit_key):
+                return None
+        pressed = pygame.key.get_pressed()
+        buttons = 0
+        for key, button in self.keys:
+            if pressed[key]:
+                buttons |= button
+        self.draw(client)
+        return buttons
+
+    def draw(self, client):
+        """Draw the mirrored game.
+
+        Args:
+            client (CoopClient): The client whose state is drawn.
+        """
+        game = self.game
+        blit = self.renderer.blit
+        if client.stats and client.stats is not self._stats:
+            # show the shared statistics on the HUD
+            self._stats = client.stats
+            for name in ('score', 'hi_score', 'level', 'ships_left'):
+                setattr(game.game_stats, name, client.stats[name])
+            game.HUD.update_scores()
+            game.HUD.update_level()
+
+        game.starfield.update()
+        game.starfield.draw()
+        for position in client.aliens():
+            blit(self.images['alien'], position)
+        for position in client.bullets:
+            blit(self.images['bullet'], position)
+        for position in client.projectiles:
+            blit(self.images['enemy_projectile'], position)
+        for player, y in client.ships.items():
+            # draw our own ship where we predict it is
+            if player == client.player:
+                y = client.ship.y
+            blit(self.images['ship'], (0, y))
+        game.HUD.draw()
+        self.renderer.present()
+
+
+async def play(host, port, bot=False):
+    """Join a server and play until the window is closed.
+
+    Args:
+        host (str): The server's address.
+        port (int): The server's port.
+        bot (bool): Let a BotPilot play without a window.
+    """
+    if bot:
+        pilot = BotPilot()
+    else:
+        pilot = CoopView()
+    client = CoopClient(pilot)
+    await client.connect(host, port)
+    print(f'Joined {host}:{port} as player {client.player}')
+    await client.run()
+    print(client.metrics)
+
+
+if __name__ == '__main__':
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=settings.coop_host)
+    parser.add_argument('--port', type=int, default=settings.coop_port)
+    parser.add_argument('--bot', action='store_true',
+        help='play with a bot instead of the keyboard, without a window')
+    args = parser.parse_args()
+    try:
+        asyncio.run(play(args.host, args.port, args.bot))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,298 @@
+"""The wire format shared by the co-op server and its clients.
+
+Every message is a frame: a little-endian uint32 payload length followed by
+the payload, whose first byte is the message type. Clients only ever send
+INPUT messages. The server sends one WELCOME when a client joins and then
+one STATE per tick.
+
+A STATE carries the fleet as an offset from the positions the aliens had
+when the fleet was created, plus the indices of aliens killed that tick.
+The full fleet layout is only sent when a client joins or a new fleet is
+created, and the statistics only when they change.
+"""
+import asyncio
+import struct
+from array import array
+
+# message types
+WELCOME = 1
+INPUT = 2
+STATE = 3
+
+# input buttons, combined into a bitmask
+UP = 1
+DOWN = 2
+FIRE = 4
+
+# optional STATE sections, flagged in the header
+FLEET_FULL = 1
+FLEET_KILLS = 2
+STATS = 4
+
+FRAME = struct.Struct('<I')
+# type, player id, tick rate, top and bottom of the play area, ship height
+WELCOME_MSG = struct.Struct('<BBHhhH')
+# type, input sequence number, buttons
+INPUT_MSG = struct.Struct('<BIB')
+# type, tick, last input sequence number applied for this client, sections
+STATE_HEADER = struct.Struct('<BIIB')
+COUNT = struct.Struct('<H')
+# fleet offset from its starting layout
+OFFSET = struct.Struct('<ff')
+# player id, ship y
+SHIP = struct.Struct('<Bf')
+# score, high score, level, ships left, game active, ship speed
+STATS_MSG = struct.Struct('<IIHBBf')
+
+# the largest frame either side accepts
+MAX_FRAME = 1 << 20
+
+
+def pack_frame(payload):
+    """Prefix a payload with its length.
+
+    Args:
+        payload (bytes): The message.
+
+    Returns:
+        bytes: The frame, ready to write to the socket.
+    """
+    return FRAME.pack(len(payload)) + payload
+
+
+async def read_frame(reader):
+    """Read one frame from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): The stream.
+
+    Returns:
+        bytes: The payload.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream closed.
+        ValueError: If the frame is larger than MAX_FRAME.
+    """
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if length > MAX_FRAME:
+        raise ValueError(f'Frame of {length} bytes is too large')
+    return await reader.readexactly(length)
+
+
+def encode_welcome(player, tick_rate, top, bottom, ship_h):
+    """Encode the message a client receives when it joins.
+
+    Args:
+        player (int): The client's player id.
+        tick_rate (int): Server ticks per second.
+        top (int): The top of the play area.
+        bottom (int): The bottom of the play area.
+        ship_h (int): The height of a ship, for predicting its movement.
+
+    Returns:
+        bytes: The payload.
+    """
+    return WELCOME_MSG.pack(WELCOME, player, tick_rate, top, bottom, ship_h)
+
+
+def decode_welcome(payload):
+    """Decode a WELCOME payload.
+
+    Args:
+        payload (bytes): The payload.
+
+    Returns:
+        dict: The player id, tick rate, play area top and bottom and ship
+        height.
+    """
+    _, player, tick_rate, top, bottom, ship_h = WELCOME_MSG.unpack(payload)
+    return {'player': player, 'tick_rate': tick_rate, 'top': top,
+        'bottom': bottom, 'ship_h': ship_h}
+
+
+def encode_input(seq, buttons):
+    """Encode a client's input for one tick.
+
+    Args:
+        seq (int): The input's sequence number.
+        buttons (int): The UP, DOWN and FIRE bits held.
+
+    Returns:
+        bytes: The payload.
+    """
+    return INPUT_MSG.pack(INPUT, seq, buttons)
+
+
+def decode_input(payload):
+    """Decode an INPUT payload.
+
+    Args:
+        payload (bytes): The payload.
+
+    Returns:
+        tuple: The sequence number and buttons.
+    """
+    _, seq, buttons = INPUT_MSG.unpack(payload)
+    return seq, buttons
+
+
+def encode_state_header(tick, ack, sections):
+    """Encode the start of a STATE payload.
+
+    Args:
+        tick (int): The server tick.
+        ack (int): The last input sequence number applied for the client.
+        sections (int): The FLEET_FULL, FLEET_KILLS and STATS bits of the
+            sections that follow.
+
+    Returns:
+        bytes: The header.
+    """
+    return STATE_HEADER.pack(STATE, tick, ack, sections)
+
+
+def encode_fleet(positions, alive):
+    """Encode the full fleet layout.
+
+    Args:
+        positions (list): The (x, y) starting position of each alien.
+        alive (list): Whether each alien is still alive.
+
+    Returns:
+        bytes: The FLEET_FULL section.
+    """
+    coords = array('h', [round(c) for position in positions for c in position])
+    mask = bytearray((len(alive) + 7) // 8)
+    for i, is_alive in enumerate(alive):
+        if is_alive:
+            mask[i >> 3] |= 1 << (i & 7)
+    return COUNT.pack(len(positions)) + coords.tobytes() + bytes(mask)
+
+
+def encode_kills(indices):
+    """Encode the aliens killed since the last tick.
+
+    Args:
+        indices (list): The killed aliens' indices in the fleet layout.
+
+    Returns:
+        bytes: The FLEET_KILLS section.
+    """
+    return COUNT.pack(len(indices)) + array('H', indices).tobytes()
+
+
+def encode_stats(score, hi_score, level, ships_left, game_active, ship_speed):
+    """Encode the game statistics.
+
+    Args:
+        score (int): The shared score.
+        hi_score (int): The high score.
+        level (int): The current level.
+        ships_left (int): The shared ships left.
+        game_active (bool): Whether the game is being played.
+        ship_speed (float): The ship speed at this level, for prediction.
+
+    Returns:
+        bytes: The STATS section.
+    """
+    return STATS_MSG.pack(score, hi_score, level, ships_left, game_active,
+        ship_speed
+        )
+
+
+def encode_world(offset, ships, bullets, projectiles):
+    """Encode the part of the state sent every tick.
+
+    Args:
+        offset (tuple): How far the fleet has moved from its starting layout.
+        ships (list): (player id, y) for every ship.
+        bullets (list): (x, y) of every player bullet.
+        projectiles (list): (x, y) of every enemy projectile.
+
+    Returns:
+        bytes: The section.
+    """
+    parts = [OFFSET.pack(*offset), bytes((len(ships),))]
+    parts.extend(SHIP.pack(player, y) for player, y in ships)
+    for points in (bullets, projectiles):
+        parts.append(COUNT.pack(len(points)))
+        parts.append(array('h', [c for point in points for c in point]).tobytes())
+    return b''.join(parts)
+
+
+def _read_points(view, offset):
+    """Read a counted list of int16 points.
+
+    Returns:
+        tuple: The list of (x, y) points and the offset after it.
+    """
+    (count,) = COUNT.unpack_from(view, offset)
+    offset += COUNT.size
+    coords = array('h')
+    coords.frombytes(view[offset:offset + count * 4])
+    return list(zip(coords[::2], coords[1::2])), offset + count * 4
+
+
+def decode_state(payload):
+    """Decode a STATE payload.
+
+    Args:
+        payload (bytes): The payload.
+
+    Returns:
+        dict: The tick, ack, fleet offset, ships, bullets and projectiles,
+        plus 'fleet' (positions and alive list), 'kills' and 'stats' when
+        those sections were sent.
+    """
+    view = memoryview(payload)
+    _, tick, ack, sections = STATE_HEADER.unpack_from(view)
+    offset = STATE_HEADER.size
+    state = {'tick': tick, 'ack': ack}
+
+    if sections & FLEET_FULL:
+        positions, offset = _read_points(view, offset)
+        count = len(positions)
+        mask = view[offset:offset + (count + 7) // 8]
+        offset += len(mask)
+        alive = [bool(mask[i >> 3] & (1 << (i & 7))) for i in range(count)]
+        state['fleet'] = (positions, alive)
+    if sections & FLEET_KILLS:
+        (count,) = COUNT.unpack_from(view, offset)
+        offset += COUNT.size
+        kills = array('H')
+        kills.frombytes(view[offset:offset + count * 2])
+        offset += count * 2
+        state['kills'] = kills.tolist()
+    if sections & STATS:
+        (score, hi_score, level, ships_left, game_active,
+            ship_speed) = STATS_MSG.unpack_from(view, offset)
+        offset += STATS_MSG.size
+        state['stats'] = {'score': score, 'hi_score': hi_score,
+            'level': level, 'ships_left': ships_left,
+            'game_active': bool(game_active), 'ship_speed': ship_speed}
+
+    state['offset'] = OFFSET.unpack_from(view, offset)
+    offset += OFFSET.size
+    ship_count = view[offset]
+    offset += 1
+    ships = []
+    for _ in range(ship_count):
+        ships.append(SHIP.unpack_from(view, offset))
+        offset += SHIP.size
+    state['ships'] = ships
+    state['bullets'], offset = _read_points(view, offset)
+    state['projectiles'], offset = _read_points(view, offset)
+    return state
+
+
+async def close_writer(writer):
+    """Close a stream, ignoring a peer that already went away.
+
+    Args:
+        writer (asyncio.StreamWriter): The stream.
+    """
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
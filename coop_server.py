@@ -0,0 +1,447 @@
+"""An authoritative co-op game server.
+
+The server runs the whole simulation (fleet, arsenals, collisions and game
+statistics) headless at a fixed tick rate. Each client controls its own
+ship by sending its input, and receives a compact state every tick.
+
+Run a server for windowed clients with:
+
+    python coop_server.py --port 50007
+"""
+import argparse
+import asyncio
+import struct
+from collections import deque
+from time import perf_counter
+import coop_protocol as protocol
+from arsenal import Arsenal
+from settings import Settings
+from ship import Ship
+
+
+class CoopPlayer:
+    """A connected client and the ship it controls."""
+
+    def __init__(self, player, ship, writer):
+        """Initialize the player.
+
+        Args:
+            player (int): The player id.
+            ship (Ship): The player's ship.
+            writer (asyncio.StreamWriter): The client's stream.
+        """
+        self.player = player
+        self.ship = ship
+        self.writer = writer
+        # inputs received but not applied yet, oldest first
+        self.inputs = deque()
+        # the input applied last tick, repeated if no new input arrives
+        self.buttons = 0
+        self.ack = 0
+        # the earliest tick the player can fire again
+        self.next_fire_tick = 0
+        # the next state must carry the full fleet and statistics
+        self.needs_keyframe = True
+        self.bytes_sent = 0
+
+
+class ServerMetrics:
+    """Records the server's tick times and the bytes it sends."""
+
+    def __init__(self):
+        """Initialize empty server metrics."""
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded ticks."""
+        self.ticks = 0
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+        self.bytes = 0
+        self.messages = 0
+        self.worst_bytes = 0
+        # clients dropped for not reading their states
+        self.dropped = 0
+
+    def record(self, seconds, sizes):
+        """Record a single tick.
+
+        Args:
+            seconds (float): How long simulating and encoding the tick took.
+            sizes (list): The size of the frame sent to each client.
+        """
+        elapsed_ms = seconds * 1000
+        self.ticks += 1
+        self.total_ms += elapsed_ms
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+        self.bytes += sum(sizes)
+        self.messages += len(sizes)
+        self.worst_bytes = max([self.worst_bytes] + sizes)
+
+    @property
+    def mean_ms(self):
+        """float: The average tick time in milliseconds."""
+        return self.total_ms / self.ticks if self.ticks else 0.0
+
+    @property
+    def bytes_per_tick(self):
+        """float: The average bytes sent to all clients per tick."""
+        return self.bytes / self.ticks if self.ticks else 0.0
+
+    @property
+    def bytes_per_message(self):
+        """float: The average size of a state sent to one client."""
+        return self.bytes / self.messages if self.messages else 0.0
+
+    def __str__(self):
+        return (f'ticks: {self.ticks}, tick mean: {self.mean_ms:.3f} ms, '
+            f'worst: {self.worst_ms:.3f} ms, {self.bytes_per_tick:.0f} B/tick, '
+            f'{self.bytes_per_message:.0f} B/client/tick, '
+            f'largest state: {self.worst_bytes} B, '
+            f'dropped clients: {self.dropped}')
+
+
+class CoopServer:
+    """Runs one shared game for every connected client."""
+
+    def __init__(self, settings=None):
+        """Create the headless game the clients share.
+
+        Args:
+            settings (Settings, optional): The settings to run with. Defaults
+                to a new Settings instance.
+        """
+        # imported here so importing this module never opens a display
+        from alien_invasion import AlienInvasion
+
+        settings = settings if settings is not None else Settings()
+        settings.headless = True
+        settings.audio_enabled = False
+        # nothing is drawn, so keep the render target tiny
+        settings.render_w = settings.screen_w // 10
+        settings.render_h = settings.screen_h // 10
+        # don't overwrite the shared atlas cache with one for the tiny target
+        settings.atlas_cache = False
+        self.settings = settings
+        self.game = AlienInvasion(settings)
+        self.tick_rate = settings.coop_rate
+        self.players = {}
+        self.metrics = ServerMetrics()
+        self.tick = 0
+        self.server = None
+        # the fleet layout clients are sent, rebuilt for every new fleet
+        self._lanes = None
+        self.layout = []
+        self.layout_index = {}
+        self.layout_alive = []
+        self._kills = []
+        self._stats = None
+        self.restart()
+
+    def restart(self):
+        """Start a new game for every player."""
+        self.game.restart_game()
+        for player in self.players.values():
+            player.ship.arsenal.arsenal.empty()
+            player.ship._center_ship()
+            player.needs_keyframe = True
+
+    async def start(self, host, port):
+        """Start accepting clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, or 0 for any free port.
+
+        Returns:
+            int: The port the server is listening on.
+        """
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop accepting clients and disconnect every player."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for player in list(self.players.values()):
+            await protocol.close_writer(player.writer)
+        self.players.clear()
+
+    async def _handle_client(self, reader, writer):
+        """Add a player and queue its input until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The client's input stream.
+            writer (asyncio.StreamWriter): The client's state stream.
+        """
+        if len(self.players) >= self.settings.coop_max_players:
+            await protocol.close_writer(writer)
+            return
+        player_id = next(i for i in range(256) if i not in self.players)
+        ship = Ship(self.game, Arsenal(self.game))
+        player = CoopPlayer(player_id, ship, writer)
+        self.players[player_id] = player
+        boundaries = ship.boundaries
+        writer.write(protocol.pack_frame(protocol.encode_welcome(player_id,
+            self.tick_rate, boundaries.top, boundaries.bottom, ship.rect.height
+            )))
+        try:
+            while True:
+                payload = await protocol.read_frame(reader)
+                if not payload:
+                    # an empty frame has no message type, drop the client
+                    break
+                if payload[0] == protocol.INPUT:
+                    player.inputs.append(protocol.decode_input(payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError,
+                struct.error):
+            # the client left or sent a frame that isn't a valid message
+            pass
+        finally:
+            self.players.pop(player_id, None)
+            await protocol.close_writer(writer)
+
+    async def run(self, duration=None):
+        """Tick at the fixed tick rate.
+
+        Args:
+            duration (float, optional): Stop after this many seconds. Runs
+                until cancelled if not given.
+        """
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        next_tick = loop.time()
+        end = None if duration is None else next_tick + duration
+        while end is None or next_tick < end:
+            # never wait for a client to read, step() drops slow ones instead
+            self.step()
+            next_tick += period
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # running behind, so start again from now instead of bursting
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def step(self):
+        """Simulate one tick and send every client its state."""
+        start = perf_counter()
+        if self.players:
+            self._apply_inputs()
+            self._simulate()
+        payloads = self._encode_states()
+        sizes = []
+        limit = self.settings.coop_write_buffer_limit
+        for player, payload in payloads:
+            frame = protocol.pack_frame(payload)
+            player.writer.write(frame)
+            player.bytes_sent += len(frame)
+            sizes.append(len(frame))
+            if player.writer.transport.get_write_buffer_size() > limit:
+                self._drop(player)
+        self.tick += 1
+        self.metrics.record(perf_counter() - start, sizes)
+
+    def _drop(self, player):
+        """Disconnect a client that stopped reading its states.
+
+        Args:
+            player (CoopPlayer): The player to drop.
+        """
+        self.players.pop(player.player, None)
+        # abort rather than close, closing would wait for the unread states
+        player.writer.transport.abort()
+        self.metrics.dropped += 1
+
+    def _apply_inputs(self):
+        """Apply one queued input per player to its ship."""
+        for player in self.players.values():
+            if player.inputs:
+                # catch up if the client has fallen far behind
+                while len(player.inputs) > self.settings.coop_input_backlog:
+                    player.inputs.popleft()
+                player.ack, player.buttons = player.inputs.popleft()
+            ship = player.ship
+            ship.moving_up = bool(player.buttons & protocol.UP)
+            ship.moving_down = bool(player.buttons & protocol.DOWN)
+            if (player.buttons & protocol.FIRE and self.game.game_active
+                    and self.tick >= player.next_fire_tick):
+                if ship.fire():
+                    player.next_fire_tick = (self.tick
+                        + self.tick_rate // self.settings.fire_rate)
+
+    def _simulate(self):
+        """Advance the shared game by one tick."""
+        game = self.game
+        if not game.game_active:
+            self.restart()
+            return
+        for player in self.players.values():
+            player.ship.update()
+        game.alien_fleet.update_fleet()
+        game.enemy_arsenal.update()
+        self._check_collisions()
+
+    def _check_collisions(self):
+        """Resolve every collision between the ships, bullets and aliens."""
+        game = self.game
+        fleet = game.alien_fleet
+        for player in self.players.values():
+            ship = player.ship
+            if (ship.check_collisions(fleet.fleet)
+                    or game.enemy_arsenal.check_collisions(ship.rect)):
+                self._lose_ship()
+                return
+        if fleet.check_fleet_bottom():
+            self._lose_ship()
+            return
+
+        for player in self.players.values():
+            collisions = fleet.check_collisions(player.ship.arsenal.arsenal)
+            if collisions:
+                game.game_stats.update(collisions)
+                self._kills.extend(
+                    self.layout_index[alien] for alien in collisions
+                    if alien in self.layout_index
+                    )
+
+        if fleet.check_destroyed_status():
+            game.level_prefetcher.advance()
+            self._reset_players()
+
+    def _lose_ship(self):
+        """Take a ship from the shared pool and restart the level, or end
+        the game when none are left.
+        """
+        stats = self.game.game_stats
+        if stats.ships_left > 0:
+            stats.ships_left -= 1
+            self.game._reset_level()
+            self._reset_players()
+        else:
+            self.game.game_active = False
+
+    def _reset_players(self):
+        """Clear every player's bullets and center their ships."""
+        for player in self.players.values():
+            player.ship.arsenal.arsenal.empty()
+            player.ship._center_ship()
+
+    def _update_layout(self):
+        """Record the starting layout of a newly created fleet.
+
+        Returns:
+            bool: True if the fleet was replaced since the last tick.
+        """
+        fleet = self.game.alien_fleet
+        # the fleet rebuilds its lanes whenever a new fleet is created
+        if fleet.lanes is self._lanes:
+            return False
+        self._lanes = fleet.lanes
+        aliens = fleet.fleet.sprites()
+        self.layout = [(alien.x, alien.y) for alien in aliens]
+        self.layout_index = {alien: i for i, alien in enumerate(aliens)}
+        self.layout_alive = [True] * len(aliens)
+        self._kills = []
+        return True
+
+    def _fleet_offset(self):
+        """Find how far the fleet has moved from its starting layout.
+
+        Returns:
+            tuple: The (x, y) offset, which every living alien shares.
+        """
+        for alien in self.game.alien_fleet.fleet:
+            index = self.layout_index.get(alien)
+            if index is not None:
+                x, y = self.layout[index]
+                return (alien.x - x, alien.y - y)
+        return (0.0, 0.0)
+
+    def _encode_states(self):
+        """Encode this tick's state for every client.
+
+        The parts every client shares are encoded once; only the header,
+        and the full fleet for clients that need it, differ per client.
+
+        Returns:
+            list: (player, payload) for every connected client.
+        """
+        game = self.game
+        new_fleet = self._update_layout()
+        kills = self._kills
+        self._kills = []
+        for index in kills:
+            self.layout_alive[index] = False
+
+        stats = game.game_stats
+        values = (stats.score, stats.hi_score, stats.level, stats.ships_left,
+            game.game_active, self.settings.ship_speed)
+        stats_changed = values != self._stats
+        self._stats = values
+
+        world = protocol.encode_world(self._fleet_offset(),
+            [(p.player, p.ship.y) for p in self.players.values()],
+            [
+                (bullet.rect.x, bullet.rect.y)
+                for p in self.players.values()
+                for bullet in p.ship.arsenal.arsenal
+                ],
+            [(p.rect.x, p.rect.y) for p in game.enemy_arsenal.active],
+            )
+        fleet = stats_section = kills_section = None
+        payloads = []
+        for player in self.players.values():
+            sections = 0
+            parts = []
+            if player.needs_keyframe or new_fleet:
+                sections |= protocol.FLEET_FULL
+                if fleet is None:
+                    fleet = protocol.encode_fleet(self.layout, self.layout_alive)
+                parts.append(fleet)
+            elif kills:
+                sections |= protocol.FLEET_KILLS
+                if kills_section is None:
+                    kills_section = protocol.encode_kills(kills)
+                parts.append(kills_section)
+            if player.needs_keyframe or stats_changed:
+                sections |= protocol.STATS
+                if stats_section is None:
+                    stats_section = protocol.encode_stats(*values)
+                parts.append(stats_section)
+            player.needs_keyframe = False
+            payloads.append((player, b''.join(
+                [protocol.encode_state_header(self.tick, player.ack, sections)]
+                + parts + [world]
+                )))
+        return payloads
+
+
+async def serve(host, port):
+    """Run a co-op server until interrupted.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+    server = CoopServer()
+    port = await server.start(host, port)
+    print(f'Co-op server listening on {host}:{port}')
+    try:
+        await server.run()
+    finally:
+        await server.stop()
+
+
+if __name__ == '__main__':
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=settings.coop_host)
+    parser.add_argument('--port', type=int, default=settings.coop_port)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,103 @@
+class DifficultyCurve:
+    """Describes how a single setting changes from level to level."""
+
+    def __init__(self, base, scale=1.0, step=0, every=1, minimum=None,
+            maximum=None, integer=False):
+        """Initialize the curve.
+
+        The value at a level is base * scale ** n + step * n, where n is the
+        number of times the curve has stepped up since level 1.
+
+        Args:
+            base (float): The value at level 1.
+            scale (float): The factor applied each time the curve steps up.
+            step (float): The amount added each time the curve steps up.
+            every (int): How many levels pass between steps.
+            minimum (float, optional): The lowest value the curve can reach.
+            maximum (float, optional): The highest value the curve can reach.
+            integer (bool): Round values to whole numbers.
+        """
+        if every < 1:
+            raise ValueError('A curve must step at least every 1 level')
+        self.base = base
+        self.scale = scale
+        self.step = step
+        self.every = every
+        self.minimum = minimum
+        self.maximum = maximum
+        self.integer = integer
+
+    def value_at(self, level):
+        """Calculate the value of the curve at a level.
+
+        Args:
+            level (int): The game level, starting at 1.
+
+        Returns:
+            float | int: The value at that level.
+        """
+        steps = (level - 1) // self.every
+        value = self.base * self.scale ** steps + self.step * steps
+        if self.minimum is not None:
+            value = max(value, self.minimum)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+        return round(value) if self.integer else value
+
+
+class DifficultyTable:
+    """Precomputed per-level settings for O(1) lookup by level."""
+
+    def __init__(self, curves, formations, levels):
+        """Build the table.
+
+        Args:
+            curves (dict): DifficultyCurve objects keyed by setting name.
+            formations (tuple): Formation names, cycled through level by level.
+            levels (int): How many levels to precompute. Higher levels are
+                computed and added to the table the first time they are used.
+        """
+        if not formations:
+            raise ValueError('At least one formation is required')
+        self.curves = curves
+        self.formations = formations
+        # index 0 is unused so levels index the table directly
+        self._levels = [None]
+        self._extend(levels)
+
+    def __len__(self):
+        return len(self._levels) - 1
+
+    def lookup(self, level):
+        """Return the settings for a level.
+
+        Args:
+            level (int): The game level, starting at 1.
+
+        Returns:
+            dict: Setting values keyed by setting name, including 'formation'.
+
+        Raises:
+            ValueError: If level is less than 1.
+        """
+        if level < 1:
+            raise ValueError('Levels start at 1')
+        if level >= len(self._levels):
+            self._extend(level)
+        return self._levels[level]
+
+    def _extend(self, levels):
+        """Compute every level up to and including levels.
+
+        Args:
+            levels (int): The highest level the table should hold.
+        """
+        for level in range(len(self._levels), levels + 1):
+            values = {
+                name: curve.value_at(level)
+                for name, curve in self.curves.items()
+                }
+            values['formation'] = self.formations[
+                (level - 1) % len(self.formations)
+                ]
+            self._levels.append(values)
@@ -0,0 +1,182 @@
+import random
+from pygame.sprite import Sprite
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+class EnemyProjectile(Sprite):
+    """A projectile fired by an alien toward the ship."""
+
+    def __init__(self, game: 'AlienInvasion', image):
+        """Create an inactive projectile for the pool.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+            This provides access to game resources like settings.
+            image (pygame.Surface): The shared projectile image.
+        """
+        super().__init__()
+        self.renderer = game.renderer
+        self.settings = game.settings
+        self.image = image
+        self.rect = self.image.get_rect()
+        self.x = 0.0
+
+    def launch(self, point):
+        """Place the projectile at an alien's front edge.
+
+        Args:
+            point (tuple): The (x, y) position to fire from.
+        """
+        self.rect.midright = point
+        self.x = float(self.rect.x)
+
+    def update(self):
+        """Move the projectile to the left of the screen."""
+        self.x -= self.settings.enemy_projectile_speed
+        self.rect.x = self.x
+
+    def draw_projectile(self):
+        """Draw the projectile to the screen."""
+        self.renderer.blit(self.image, self.rect)
+
+
+class EnemyArsenal:
+    """Manages a fixed-size pool of alien projectiles and decides which
+    alien fires next.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Preallocate every projectile the aliens can have in flight.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+            This provides access to game resources like settings and the fleet.
+        """
+        self.game = game
+        self.settings = game.settings
+        image = game.atlas.get('enemy_projectile')
+        # the pool never grows, so firing never allocates
+        self.free = [
+            EnemyProjectile(game, image)
+            for _ in range(self.settings.enemy_projectile_capacity)
+            ]
+        self.active = []
+        # rects of the active projectiles, for a single collision query
+        self.rects = []
+        self.rng = random.Random()
+        seed = self.settings.enemy_fire_seed
+        self.seed(seed if seed is not None else random.getrandbits(63))
+
+    def seed(self, seed):
+        """Restart the choice of shooters and shot timing from a seed, so a
+        game can be replayed exactly.
+
+        Args:
+            seed (int): The seed.
+        """
+        self.base_seed = seed
+        # the number of cooldowns drawn so far, the position in the seed
+        self.shots = 0
+        self._reset_cooldown()
+
+    def restore(self, seed, shots, cooldown):
+        """Return enemy fire to a position stored in a snapshot.
+
+        Args:
+            seed (int): The seed, as base_seed.
+            shots (int): The number of cooldowns drawn, as shots.
+            cooldown (int): The frames left before the next shot.
+        """
+        self.base_seed = seed
+        # redraw the current cooldown, leaving the generator where it was
+        self.shots = shots - 1
+        self._reset_cooldown()
+        self.cooldown = cooldown
+
+    def _reset_cooldown(self):
+        """Wait a slightly random number of frames before the next shot.
+
+        Each cooldown, and the shooter chosen when it runs out, draws from
+        its own seed derived from base_seed and shots. Those two numbers
+        and the cooldown are all a snapshot needs to replay enemy fire.
+        """
+        self.rng.seed(hash((self.base_seed, self.shots)))
+        self.shots += 1
+        interval = self.settings.enemy_fire_interval
+        self.cooldown = self.rng.randint(interval // 2, interval + interval // 2)
+
+    def fire(self, point):
+        """Take a projectile from the pool and fire it.
+
+        Args:
+            point (tuple): The (x, y) position to fire from.
+
+        Returns:
+            bool: True if a projectile was fired, False if the pool was empty.
+        """
+        if not self.free:
+            return False
+        projectile = self.free.pop()
+        projectile.launch(point)
+        self.active.append(projectile)
+        return True
+
+    def choose_shooter(self):
+        """Pick a random alien from the front of the fleet.
+
+        Returns:
+            Alien | None: The alien to fire, or None if the fleet is empty.
+        """
+        fronts = self.game.alien_fleet.front_aliens()
+        return self.rng.choice(fronts) if fronts else None
+
+    def update(self):
+        """Fire when the cooldown is over, move every active projectile and
+        return the ones that left the screen to the pool.
+        """
+        if self.settings.enemy_fire_enabled:
+            self.cooldown -= 1
+            if self.cooldown <= 0:
+                shooter = self.choose_shooter()
+                if shooter is not None:
+                    self.fire(shooter.rect.midleft)
+                self._reset_cooldown()
+
+        still_active = []
+        for projectile in self.active:
+            projectile.update()
+            if projectile.rect.right > 0:
+                still_active.append(projectile)
+            else:
+                self.free.append(projectile)
+        self.active = still_active
+        self.rects = [projectile.rect for projectile in still_active]
+
+    def check_collisions(self, rect):
+        """Check whether any projectile hit a rect, and remove it if so.
+
+        Args:
+            rect (pygame.Rect): The rect to test, usually the ship's.
+
+        Returns:
+            bool: True if a projectile hit the rect.
+        """
+        index = rect.collidelist(self.rects)
+        if index == -1:
+            return False
+        self.free.append(self.active.pop(index))
+        self.rects.pop(index)
+        return True
+
+    def empty(self):
+        """Return every active projectile to the pool."""
+        self.free.extend(self.active)
+        self.active = []
+        self.rects = []
+
+    def draw(self):
+        """Draw all active projectiles to the screen."""
+        for projectile in self.active:
+            projectile.draw_projectile()
@@ -49,7 +49,7 @@ class GameStats():
         """Reset game statistics that can change during the game."""
         self.ships_left = self.settings.staring_ship_count
         self.score = 0
-        self.level = 1
+        self.level = self.settings.start_level
 
     def update(self, collisions):
         """Update game statistics based on game events.
@@ -16,8 +16,8 @@ class HUD:
         """
         self.game = game
         self.settings = game.settings
-        self.screen = game.screen
-        self.boundaries = game.screen.get_rect()
+        self.renderer = game.renderer
+        self.boundaries = game.renderer.boundaries
         self.game_stats = game.game_stats
         self.font = pygame.font.Font(self.settings.font_file,
             self.settings.HUD_font_size
@@ -32,11 +32,8 @@ class HUD:
         self.update_level()
 
     def _setup_life_image(self):
-        """Load and scale the image used to represent remaining lives."""
-        self.life_image = pygame.image.load(self.settings.ship_file)
-        self.life_image = pygame.transform.scale(self.life_image, 
-            (self.settings.ship_w, self.settings.ship_h)
-            )
+        """Get the scaled image used to represent remaining lives."""
+        self.life_image = self.game.atlas.get('life')
         self.life_rect = self.life_image.get_rect()
 
     def update_scores(self):
@@ -76,26 +73,50 @@ class HUD:
 
     def update_level(self):
         """Render the current game level to an image and position it at the top-left."""
-        level_str = f'Level: {self.game_stats.level: ,.0f}'
-        self.level_image = self.font.render(level_str, True,
+        self.set_level_image(*self.render_level(self.game_stats.level, self.font))
+
+    def render_level(self, level, font):
+        """Render a game level to an image and position it at the top-left.
+
+        Args:
+            level (int): The level to render.
+            font (pygame.font.Font): The font to render with. Background threads
+                must pass their own font rather than sharing the HUD's.
+
+        Returns:
+            tuple: The rendered level image and its positioned rect.
+        """
+        level_str = f'Level: {level: ,.0f}'
+        level_image = font.render(level_str, True,
             self.settings.text_color, None
             )
-        self.level_rect = self.level_image.get_rect()
-        self.level_rect.left = self.padding
-        self.level_rect.top = self.life_rect.bottom + self.padding
+        level_rect = level_image.get_rect()
+        level_rect.left = self.padding
+        level_rect.top = self.life_rect.bottom + self.padding
+        return level_image, level_rect
+
+    def set_level_image(self, level_image, level_rect):
+        """Swap in a pre-rendered level image.
+
+        Args:
+            level_image (pygame.Surface): The rendered level text.
+            level_rect (pygame.Rect): The positioned rect for the level text.
+        """
+        self.level_image = level_image
+        self.level_rect = level_rect
 
     def _draw_lives(self):
         """Draw the remaining lives icons on the screen."""
         current_x = self.padding
         current_y = self.padding
         for i in range(self.game_stats.ships_left):
-            self.screen.blit(self.life_image, (current_x, current_y))
+            self.renderer.blit(self.life_image, (current_x, current_y))
             current_x += self.life_rect.width + self.padding
 
     def draw(self):
         """Draw all HUD elements to the screen."""
-        self.screen.blit(self.hi_score_image, self.hi_score_rect)
-        self.screen.blit(self.max_score_image, self.max_score_rect)
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
+        self.renderer.blit(self.hi_score_image, self.hi_score_rect)
+        self.renderer.blit(self.max_score_image, self.max_score_rect)
+        self.renderer.blit(self.score_image, self.score_rect)
+        self.renderer.blit(self.level_image, self.level_rect)
         self._draw_lives()
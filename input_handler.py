@@ -0,0 +1,137 @@
+import pygame
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+class InputMetrics:
+    """Records how long event handling takes each tick."""
+
+    def __init__(self):
+        """Initialize empty input metrics."""
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded ticks."""
+        self.ticks = 0
+        self.events = 0
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+
+    def record(self, seconds, events):
+        """Record the event handling of a single tick.
+
+        Args:
+            seconds (float): How long event handling took.
+            events (int): How many events were pulled from the queue.
+        """
+        elapsed_ms = seconds * 1000
+        self.ticks += 1
+        self.events += events
+        self.total_ms += elapsed_ms
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+
+    @property
+    def mean_ms(self):
+        """float: The average event handling time per tick in milliseconds."""
+        return self.total_ms / self.ticks if self.ticks else 0.0
+
+    def __str__(self):
+        return (f'ticks: {self.ticks}, events: {self.events}, '
+            f'mean: {self.mean_ms:.4f} ms, worst: {self.worst_ms:.4f} ms')
+
+
+class InputHandler:
+    """Filters the event queue and polls the keyboard once per tick."""
+
+    # the only event types the game responds to
+    ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN)
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Initialize the input handler and filter the event queue.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings, the ship and game actions.
+        """
+        self.game = game
+        self.settings = game.settings
+        self.metrics = InputMetrics()
+        # the earliest time in milliseconds the held fire key can fire again
+        self.next_fire_time = 0
+        self.bind_keys(self.settings.key_bindings)
+        self.filter_events()
+
+    def filter_events(self):
+        """Block every event type except the ones the game responds to so
+        pygame drops them before they reach the queue.
+        """
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.ALLOWED_EVENTS)
+
+    def bind_keys(self, key_bindings):
+        """Resolve key names to pygame key codes.
+
+        Args:
+            key_bindings (dict): Key names keyed by action ('up', 'down',
+                'fire' and 'quit'), e.g. {'fire': 'space'}.
+
+        Raises:
+            ValueError: If an action is missing or a key name is unknown.
+        """
+        keys = {}
+        for action in ('up', 'down', 'fire', 'quit'):
+            try:
+                keys[action] = pygame.key.key_code(key_bindings[action])
+            except KeyError:
+                raise ValueError(f'No key bound to {action!r}')
+            except ValueError:
+                raise ValueError(
+                    f'Unknown key {key_bindings[action]!r} for {action!r}'
+                    )
+        self.keys = keys
+
+    def check_events(self):
+        """Respond to queued events and the keys currently held down."""
+        start = perf_counter()
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.game.quit_game()
+            elif event.type == pygame.KEYDOWN and self.game.game_active:
+                self._check_keydown_event(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.game._check_button_clicked()
+        self._check_held_keys()
+        self.metrics.record(perf_counter() - start, len(events))
+
+    def _check_keydown_event(self, event):
+        """Respond to a key press.
+
+        Args:
+            event (pygame.event.Event): The KEYDOWN event.
+        """
+        if event.key == self.keys['quit']:
+            self.game.quit_game()
+        elif event.key == self.keys['fire'] and not self.settings.auto_fire:
+            self.game.fire_bullet()
+
+    def _check_held_keys(self):
+        """Move the ship and auto-fire based on the keys held this tick."""
+        pressed = pygame.key.get_pressed()
+        ship = self.game.ship
+        ship.moving_up = pressed[self.keys['up']]
+        ship.moving_down = pressed[self.keys['down']]
+
+        if (self.settings.auto_fire and self.game.game_active
+                and pressed[self.keys['fire']]):
+            self._auto_fire()
+
+    def _auto_fire(self):
+        """Fire while the fire key is held, no faster than the fire rate."""
+        now = pygame.time.get_ticks()
+        if now < self.next_fire_time:
+            return
+        if self.game.fire_bullet():
+            self.next_fire_time = now + 1000 // self.settings.fire_rate
@@ -0,0 +1,191 @@
+import threading
+from time import perf_counter
+import pygame.font
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+class PreparedLevel:
+    """Holds everything the next level needs so it can be swapped in at once."""
+
+    def __init__(self, level, formation, alien_image, aliens, difficulty,
+            level_image, level_rect):
+        """Store the prepared state of a level.
+
+        Args:
+            level (int): The level number the state was prepared for.
+            formation (list): The (x, y) positions of the aliens.
+            alien_image (pygame.Surface): The scaled and rotated alien image.
+            aliens (list): Aliens built from the formation, not yet in the fleet.
+            difficulty (dict): The settings for the level.
+            level_image (pygame.Surface): The pre-rendered HUD level text.
+            level_rect (pygame.Rect): The positioned rect for the level text.
+        """
+        self.level = level
+        self.formation = formation
+        self.alien_image = alien_image
+        self.aliens = aliens
+        self.difficulty = difficulty
+        self.level_image = level_image
+        self.level_rect = level_rect
+
+
+class TransitionMetrics:
+    """Records how long level transition frames take."""
+
+    def __init__(self):
+        """Initialize empty transition metrics."""
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded transitions."""
+        self.count = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.last_missed = False
+        self.worst_ms = 0.0
+        # transitions where the prefetch had not finished and had to be waited on
+        self.misses = 0
+
+    def record(self, seconds, missed):
+        """Record the duration of a single transition.
+
+        Args:
+            seconds (float): How long the transition took.
+            missed (bool): True if the prepared level was not ready in time.
+        """
+        elapsed_ms = seconds * 1000
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.last_missed = missed
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+        if missed:
+            self.misses += 1
+
+    @property
+    def mean_ms(self):
+        """float: The average transition time in milliseconds."""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def __str__(self):
+        return (f'transitions: {self.count}, last: {self.last_ms:.3f} ms, '
+            f'mean: {self.mean_ms:.3f} ms, worst: {self.worst_ms:.3f} ms, '
+            f'misses: {self.misses}')
+
+
+class LevelPrefetcher:
+    """Prepares the next level on a background thread while the current one
+    is being played, so the transition frame only has to swap state in.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Initialize the prefetcher.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings, the fleet, statistics and the HUD.
+        """
+        self.game = game
+        self.settings = game.settings
+        # the HUD font must not be shared with the background thread
+        self.font = pygame.font.Font(self.settings.font_file,
+            self.settings.HUD_font_size
+            )
+        self.metrics = TransitionMetrics()
+        self._thread = None
+        self._prepared = None
+        # an exception raised on the prefetch thread, re-raised by take()
+        self._error = None
+
+    def start(self):
+        """Start preparing the level after the current one."""
+        # wait for any earlier prefetch so only one thread runs at a time
+        self._join()
+        self._prepared = None
+        self._error = None
+        # read the current state on the main thread
+        level = self.game.game_stats.level + 1
+        difficulty = self.settings.difficulty_for(level)
+        self._thread = threading.Thread(target=self._prepare,
+            args=(level, difficulty), daemon=True
+            )
+        self._thread.start()
+
+    def take(self):
+        """Return the prepared next level, waiting for it if necessary.
+
+        Returns:
+            tuple: The PreparedLevel and a bool that is True if it was not
+            ready and had to be waited on or built on the spot.
+
+        Raises:
+            Exception: Whatever preparing the level raised on the prefetch
+                thread.
+        """
+        missed = self._prepared is None
+        if self._thread is None:
+            self.start()
+        self._join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        prepared = self._prepared
+        self._prepared = None
+        return prepared, missed
+
+    def advance(self):
+        """Swap the prepared level into the game and start preparing the one after.
+
+        Returns:
+            PreparedLevel: The level that was swapped in.
+        """
+        start = perf_counter()
+        prepared, missed = self.take()
+        game = self.game
+
+        # swap in the new fleet
+        game.ship.arsenal.arsenal.empty()
+        game.enemy_arsenal.empty()
+        game.alien_fleet.fleet.empty()
+        game.alien_fleet.alien_image = prepared.alien_image
+        game.alien_fleet.create_fleet(prepared.aliens)
+        # swap in the level's difficulty settings
+        self.settings.apply_level(prepared.level)
+        # swap in the new level and its pre-rendered HUD text
+        game.game_stats.update_level()
+        game.HUD.set_level_image(prepared.level_image, prepared.level_rect)
+
+        self.metrics.record(perf_counter() - start, missed)
+        self.start()
+        return prepared
+
+    def _join(self):
+        """Wait for the running prefetch thread to finish, if there is one."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _prepare(self, level, difficulty):
+        """Build the state for a level. Runs on the prefetch thread.
+
+        Args:
+            level (int): The level number to prepare.
+            difficulty (dict): The settings for the level.
+        """
+        fleet = self.game.alien_fleet
+        try:
+            formation = fleet.calculate_formation(difficulty['formation'])
+            alien_image = fleet.load_alien_image()
+            aliens = fleet.build_aliens(formation, alien_image)
+            level_image, level_rect = self.game.HUD.render_level(level,
+                self.font
+                )
+        except Exception as e:
+            # hand the error to the main thread instead of losing it here
+            self._error = e
+            return
+        self._prepared = PreparedLevel(level, formation, alien_image, aliens,
+            difficulty, level_image, level_rect
+            )
@@ -0,0 +1,273 @@
+"""Track memory across level boundaries and flag growth beyond a budget.
+
+Run a headless soak test from the repository root, for example:
+
+    python memory_budget.py --levels 300
+
+The soak test exits with status 1 if memory grew beyond the budget.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# only allocations made by the game's own modules are attributed, and
+# never the tracker's own samples
+SOURCE_FILTERS = (
+    tracemalloc.Filter(True, str(Path(__file__).resolve().parent / '*')),
+    tracemalloc.Filter(False, __file__),
+    )
+# the object types counted at every sample, by class name
+COUNTED_TYPES = ('Alien', 'Bullet', 'EnemyProjectile', 'Surface')
+
+
+class MemorySample:
+    """Memory use at a single level boundary."""
+
+    def __init__(self, level, traced, peak, sprites, objects, snapshot):
+        """Initialize the sample.
+
+        Args:
+            level (int): The level that just ended.
+            traced (int): Bytes allocated by the game's modules and still
+                in use.
+            peak (int): The most bytes Python had in use since the last
+                sample.
+            sprites (dict): Sprite counts keyed by group name.
+            objects (dict): Live object counts keyed by class name.
+            snapshot (tracemalloc.Snapshot): Allocations by the game's
+                modules. Only kept for the baseline and the latest sample.
+        """
+        self.level = level
+        self.traced = traced
+        self.peak = peak
+        self.sprites = sprites
+        self.objects = objects
+        self.snapshot = snapshot
+
+    def __str__(self):
+        counts = ', '.join(
+            f'{name}: {count}'
+            for name, count in {**self.sprites, **self.objects}.items()
+            )
+        return (f'level {self.level}: {self.traced / 1024:.1f} KiB traced, '
+            f'peak {self.peak / 1024:.1f} KiB, {counts}')
+
+
+class MemoryTracker:
+    """Samples memory at level boundaries and attributes growth to the
+    lines that allocated it.
+
+    The first samples, taken while caches such as scaled images and
+    rendered text fill up, are skipped. The sample after them is the
+    baseline every later sample is compared to.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Initialize the tracker. Nothing is tracked unless it is enabled.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings and the sprite groups.
+        """
+        self.game = game
+        self.settings = game.settings
+        self.enabled = self.settings.memory_tracking
+        self.samples = []
+        self.baseline = None
+        self.levels = 0
+        # samples where growth since the baseline was over the budget
+        self.over_budget = []
+
+    def start(self):
+        """Start tracing allocations."""
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.settings.memory_trace_frames)
+
+    def stop(self):
+        """Stop tracing allocations."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def level_done(self):
+        """Sample memory at a level boundary."""
+        if not self.enabled:
+            return
+        self.levels += 1
+        if self.levels <= self.settings.memory_warmup_levels:
+            return
+        sample = self.sample()
+        self.samples.append(sample)
+        if self.baseline is None:
+            self.baseline = sample
+        else:
+            if len(self.samples) > 2:
+                # keep only the snapshots that are compared, they are large
+                self.samples[-2].snapshot = None
+            if self.growth(sample) > self.settings.memory_budget:
+                self.over_budget.append(sample)
+        self.game.telemetry.emit('memory', sample.traced // 1024,
+            sample.objects['Surface']
+            )
+
+    def sample(self):
+        """Take a sample of the current memory use.
+
+        Returns:
+            MemorySample: The sample.
+        """
+        game = self.game
+        # leave only memory that is really still referenced
+        gc.collect()
+        _, peak = tracemalloc.get_traced_memory()
+        sprites = {
+            'fleet': len(game.alien_fleet.fleet),
+            'bullets': len(game.ship.arsenal.arsenal),
+            'enemy_projectiles': len(game.enemy_arsenal.active),
+            'particles': len(game.particles),
+            }
+        snapshot = tracemalloc.take_snapshot().filter_traces(SOURCE_FILTERS)
+        traced = sum(stat.size for stat in snapshot.statistics('filename'))
+        objects = count_objects()
+        # start the next peak after the sample's own allocations are freed
+        tracemalloc.reset_peak()
+        return MemorySample(game.game_stats.level, traced, peak, sprites,
+            objects, snapshot
+            )
+
+    def growth(self, sample):
+        """Return how much more memory a sample uses than the baseline.
+
+        Args:
+            sample (MemorySample): A sample taken after the baseline.
+
+        Returns:
+            int: The growth in bytes.
+        """
+        return sample.traced - self.baseline.traced
+
+    def top_growth(self, limit=None):
+        """Attribute the growth since the baseline to module and line.
+
+        Args:
+            limit (int, optional): How many lines to return. Defaults to
+                Settings.memory_report_lines.
+
+        Returns:
+            list: tracemalloc.StatisticDiff entries, largest growth first.
+        """
+        if len(self.samples) < 2:
+            return []
+        limit = limit or self.settings.memory_report_lines
+        stats = self.samples[-1].snapshot.compare_to(self.baseline.snapshot,
+            'lineno'
+            )
+        return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+    def report(self):
+        """Describe the memory use across every sampled level.
+
+        Returns:
+            str: The report.
+        """
+        if not self.samples:
+            return 'No levels sampled'
+        last = self.samples[-1]
+        lines = [
+            f'baseline {self.baseline}',
+            f'final    {last}',
+            f'growth: {self.growth(last) / 1024:.1f} KiB over '
+            f'{len(self.samples) - 1} levels '
+            f'(budget {self.settings.memory_budget / 1024:.1f} KiB)',
+            ]
+        for name in last.objects:
+            change = last.objects[name] - self.baseline.objects[name]
+            if change:
+                lines.append(f'  {name} objects: {change:+d}')
+        growth = self.top_growth()
+        if growth:
+            lines.append('largest growth by line:')
+            for stat in growth:
+                frame = stat.traceback[0]
+                lines.append(f'  {Path(frame.filename).name}:{frame.lineno}: '
+                    f'{stat.size_diff / 1024:+.1f} KiB, '
+                    f'{stat.count_diff:+d} blocks')
+        if self.over_budget:
+            lines.append(f'OVER BUDGET from level {self.over_budget[0].level}')
+        return '\n'.join(lines)
+
+
+def count_objects():
+    """Count the live objects of each type in COUNTED_TYPES.
+
+    Surfaces are not tracked by the garbage collector, so objects are found
+    through the references held by the tracked ones.
+
+    Returns:
+        dict: Counts keyed by class name.
+    """
+    referents = gc.get_referents(*gc.get_objects())
+    # each object once, however many references to it there are
+    unique = dict(zip(map(id, referents), referents))
+    counts = dict.fromkeys(COUNTED_TYPES, 0)
+    for kind, count in Counter(map(type, unique.values())).items():
+        if kind.__name__ in counts:
+            counts[kind.__name__] += count
+    return counts
+
+
+def soak(levels, lost_ship_every=5):
+    """Play many levels headless and track memory across them.
+
+    Each level is cleared by removing the fleet, so the soak test spends
+    its time rebuilding levels rather than playing them.
+
+    Args:
+        levels (int): How many levels to play.
+        lost_ship_every (int): Lose a ship every this many levels too, so
+            the level reset path is rebuilt as well.
+
+    Returns:
+        MemoryTracker: The tracker, holding every sample.
+    """
+    from alien_invasion import AlienInvasion
+    from settings import Settings
+
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.telemetry_enabled = False
+    settings.memory_tracking = True
+    # keep the speeds constant, hundreds of levels in they grow without bound
+    settings.apply_overrides({'difficulty_scale': 1.0})
+    game = AlienInvasion(settings)
+    game.restart_game()
+    tracker = game.memory_tracker
+    while tracker.levels < levels:
+        # play a few frames of the level with some bullets in flight
+        for _ in range(10):
+            game.fire_bullet()
+            game.step()
+        # never run out of ships
+        game.game_stats.ships_left = settings.staring_ship_count
+        if lost_ship_every and tracker.levels % lost_ship_every == 0:
+            game._check_game_status()
+        game.alien_fleet.fleet.empty()
+        game.step()
+    return tracker
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', type=int, default=300)
+    args = parser.parse_args()
+    tracker = soak(args.levels)
+    print(tracker.report())
+    tracker.stop()
+    sys.exit(1 if tracker.over_budget else 0)
@@ -0,0 +1,157 @@
+import numpy as np
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# kinds of particle, used to index the cached animation frames
+EXPLOSION = 0
+FLASH = 1
+
+
+class ParticleSystem:
+    """Manages hit explosions and muzzle flashes as arrays of particles.
+
+    Every particle lives in a slot of a set of preallocated NumPy arrays.
+    New particles are written to the slots in turn, so once the particle
+    budget is reached the oldest particles are the ones replaced.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Preallocate the particle arrays and cache the animation frames.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings and the renderer.
+        """
+        self.settings = game.settings
+        self.renderer = game.renderer
+        self.capacity = self.settings.particle_capacity
+        # never use more slots than were allocated
+        self.budget = min(self.settings.particle_budget, self.capacity)
+
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.age = np.zeros(self.capacity, dtype=np.float32)
+        self.life = np.ones(self.capacity, dtype=np.float32)
+        self.frame = np.zeros(self.capacity, dtype=np.int16)
+        self.kind = np.zeros(self.capacity, dtype=np.int8)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        # the slot the next particle is written to
+        self._next = 0
+        self._rng = np.random.default_rng()
+
+        self.atlas = game.atlas
+        self.frames = self._load_frames()
+        self.areas = self._load_areas()
+        self.frame_counts = np.array([len(f) for f in self.frames])
+
+    def _load_frames(self):
+        """Look up the animation frames for each kind of particle in the atlas.
+
+        Returns:
+            list: A list of frame surfaces for each particle kind.
+        """
+        return [self.atlas.get_frames('explosion'), self.atlas.get_frames('flash')]
+
+    def _load_areas(self):
+        """Look up where each animation frame sits in the atlas surface.
+
+        Returns:
+            list: A list of frame areas for each particle kind.
+        """
+        return [
+            [self.atlas.area(name, index) for index in range(len(frames))]
+            for name, frames in (('explosion', self.frames[EXPLOSION]),
+                ('flash', self.frames[FLASH]))
+            ]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def emit(self, kind, x, y, count, speed, life):
+        """Emit a burst of particles from a point.
+
+        Args:
+            kind (int): EXPLOSION or FLASH.
+            x (float): The horizontal gameplay position.
+            y (float): The vertical gameplay position.
+            count (int): How many particles to emit.
+            speed (float): The maximum speed in pixels per frame.
+            life (int): How many frames each particle lives.
+        """
+        count = min(count, self.budget)
+        slots = (self._next + np.arange(count)) % self.budget
+        self._next = (self._next + count) % self.budget
+
+        angle = self._rng.uniform(0, 2 * np.pi, count)
+        magnitude = self._rng.uniform(0, speed, count)
+        self.pos[slots] = (x, y)
+        self.vel[slots, 0] = np.cos(angle) * magnitude
+        self.vel[slots, 1] = np.sin(angle) * magnitude
+        self.age[slots] = 0
+        self.life[slots] = life
+        self.frame[slots] = 0
+        self.kind[slots] = kind
+        self.alive[slots] = True
+
+    def explode(self, center):
+        """Emit an explosion where an alien was hit.
+
+        Args:
+            center (tuple): The (x, y) gameplay position of the hit.
+        """
+        self.emit(EXPLOSION, center[0], center[1],
+            self.settings.explosion_particles, self.settings.particle_speed,
+            self.settings.particle_life
+            )
+
+    def flash(self, point):
+        """Emit a muzzle flash where a bullet was fired.
+
+        Args:
+            point (tuple): The (x, y) gameplay position of the muzzle.
+        """
+        self.emit(FLASH, point[0], point[1], 1, 0, self.settings.flash_life)
+
+    def update(self):
+        """Move, age and animate every particle in one step."""
+        self.pos += self.vel
+        self.age += 1
+        self.alive &= self.age < self.life
+        self.frame[:] = np.minimum(
+            self.age * self.frame_counts[self.kind] // self.life,
+            self.frame_counts[self.kind] - 1
+            )
+
+    def clear(self):
+        """Remove every particle."""
+        self.alive[:] = False
+
+    def draw(self):
+        """Draw every live particle with a single batched blit."""
+        live = np.flatnonzero(self.alive)
+        if not live.size:
+            return
+        renderer = self.renderer
+        kinds = self.kind[live].tolist()
+        frames = self.frame[live].tolist()
+        sizes = np.array([
+            self.areas[kind][frame].size for kind, frame in zip(kinds, frames)
+            ])
+        # center each frame on its particle
+        positions = (self.pos[live] - sizes // 2).tolist()
+
+        if not renderer.is_scaled:
+            # area-blit every frame straight out of the atlas surface
+            surface = self.atlas.surface
+            renderer.target.blits([
+                (surface, position, self.areas[kind][frame])
+                for kind, frame, position in zip(kinds, frames, positions)
+                ], doreturn=False)
+        else:
+            renderer.target.blits([
+                (renderer.prescale(self.frames[kind][frame]),
+                    renderer.map_point(position))
+                for kind, frame, position in zip(kinds, frames, positions)
+                ], doreturn=False)
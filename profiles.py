@@ -0,0 +1,252 @@
+import json
+import tomllib
+import warnings
+from pathlib import Path
+import pygame
+from alien_fleet import AlienFleet
+from capture import FORMATS
+from renderer import Renderer
+from settings import ASSETS_DIR, BASE_DIR
+
+PROFILE_DIR = ASSETS_DIR / 'profiles'
+PROFILE_SUFFIXES = ('.toml', '.json')
+# the allowed values of settings that are one of a few choices; for a
+# list setting every item must be one of them
+CHOICES = {
+    'render_mode': Renderer.MODES,
+    'capture_format': FORMATS,
+    'formations': AlienFleet.FORMATIONS,
+    'fleet_direction': (1, -1),
+}
+# settings that must be greater than zero: sizes, rates, capacities and
+# the first level
+POSITIVE = ('screen_w', 'screen_h', 'render_w', 'render_h', 'FPS',
+    'difficulty_scale', 'start_level', 'precomputed_levels',
+    'starfield_strip_h', 'ship_w', 'ship_h', 'bullet_w', 'bullet_h',
+    'alien_w', 'alien_h', 'enemy_projectile_w', 'enemy_projectile_h',
+    'enemy_projectile_capacity', 'fire_rate', 'telemetry_capacity',
+    'telemetry_flush_interval', 'memory_trace_frames', 'memory_report_lines',
+    'capture_every', 'capture_scale', 'capture_buffers',
+    'capture_stop_timeout', 'atlas_width', 'flash_life', 'particle_capacity',
+    'particle_budget', 'particle_life', 'coop_tick_rate', 'coop_max_players',
+    'coop_input_backlog', 'coop_write_buffer_limit', 'button_w', 'button_h',
+    'button_font_size', 'HUD_font_size')
+# settings that can be zero but not negative: speeds, counts and intervals
+NON_NEGATIVE = ('starfield_bg_speed', 'ship_speed', 'bullet_speed',
+    'fleet_speed', 'bullet_amount', 'alien_points', 'staring_ship_count',
+    'enemy_projectile_speed', 'enemy_fire_interval', 'memory_warmup_levels',
+    'memory_budget', 'explosion_particles', 'particle_speed', 'coop_port')
+# list settings that can have any number of items, each shaped like the
+# default's first item; every other list has the default's exact shape
+LISTS = ('formations', 'starfield_layers', 'particle_frames',
+    'atlas_animations')
+
+
+def available_profiles():
+    """List the names of the profiles in PROFILE_DIR.
+
+    Returns:
+        list: The profile names, sorted.
+    """
+    return sorted(
+        path.stem for path in PROFILE_DIR.iterdir()
+        if path.suffix in PROFILE_SUFFIXES
+        )
+
+
+def find_profile(profile):
+    """Find the file of a profile.
+
+    Args:
+        profile (str | Path): The name of a profile in PROFILE_DIR, or the
+            path of a .toml or .json file.
+
+    Returns:
+        Path: The profile file.
+
+    Raises:
+        FileNotFoundError: If there is no such profile.
+    """
+    path = Path(profile)
+    if path.suffix in PROFILE_SUFFIXES and path.exists():
+        return path
+    for suffix in PROFILE_SUFFIXES:
+        candidate = PROFILE_DIR / f'{profile}{suffix}'
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f'No profile {str(profile)!r}, available profiles: '
+        + ', '.join(available_profiles())
+        )
+
+
+def load_profile(profile):
+    """Read the settings in a profile.
+
+    Args:
+        profile (str | Path): The name of a profile in PROFILE_DIR, or the
+            path of a .toml or .json file.
+
+    Returns:
+        dict: Setting values keyed by setting name.
+
+    Raises:
+        FileNotFoundError: If there is no such profile.
+        ValueError: If the file is not valid TOML or JSON.
+    """
+    path = find_profile(profile)
+    if path.suffix == '.toml':
+        with path.open('rb') as file:
+            return tomllib.load(file)
+    return json.loads(path.read_text())
+
+
+def _convert(name, value, current):
+    """Convert a value read from a profile to the type of a setting.
+
+    Args:
+        name (str): The setting name.
+        value (object): The value from the profile.
+        current (object): The setting's current value.
+
+    Returns:
+        object: The converted value.
+
+    Raises:
+        ValueError: If the value has the wrong type.
+    """
+    def wrong_type(expected):
+        return ValueError(f'{name} must be {expected}, not {value!r}')
+
+    if isinstance(current, bool):
+        if not isinstance(value, bool):
+            raise wrong_type('true or false')
+    elif isinstance(current, (int, float)) or current is None:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise wrong_type('a number')
+        # counts and sizes must be whole, speeds can be fractions
+        whole = (current is None or isinstance(current, int)
+            and not name.endswith('speed'))
+        if whole and not isinstance(value, int):
+            raise wrong_type('a whole number')
+    elif isinstance(current, Path):
+        if not isinstance(value, str):
+            raise wrong_type('a path')
+        # relative paths are relative to the game, not the working directory
+        value = BASE_DIR / value
+    elif isinstance(current, tuple):
+        if not isinstance(value, list):
+            raise wrong_type('a list')
+        if name in LISTS:
+            if not current:
+                # no default item to check the items against
+                return _to_tuple(value)
+            templates = [current[0]] * len(value)
+        elif len(value) != len(current):
+            raise wrong_type(f'a list of {len(current)} items')
+        else:
+            templates = current
+        value = tuple(
+            _convert(f'{name}[{i}]', item, template)
+            for i, (item, template) in enumerate(zip(value, templates))
+            )
+    elif isinstance(current, dict):
+        if not isinstance(value, dict):
+            raise wrong_type('a table')
+        unknown = sorted(value.keys() - current.keys())
+        if unknown:
+            raise ValueError(f'{name} has no {", ".join(map(repr, unknown))}, '
+                f'only {", ".join(map(repr, current))}')
+        # entries the profile leaves out keep their current value
+        value = {**current, **{
+            key: _convert(f'{name}.{key}', item, current[key])
+            for key, item in value.items()
+            }}
+    elif not isinstance(value, type(current)):
+        raise wrong_type(f'a {type(current).__name__}')
+    return value
+
+
+def _key_errors(key_bindings):
+    """Check that every key name in a set of key bindings exists.
+
+    Args:
+        key_bindings (dict): Key names keyed by action.
+
+    Returns:
+        list: An error for every unknown key name.
+    """
+    errors = []
+    for action, key in key_bindings.items():
+        try:
+            # key names are looked up in a table, the display isn't needed
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                pygame.key.key_code(key)
+        except ValueError:
+            errors.append(f'key_bindings.{action} must be a key name, not {key!r}')
+    return errors
+
+
+def _to_tuple(value):
+    """Convert nested lists to nested tuples, the form Settings uses.
+
+    Args:
+        value (object): A value from a profile.
+
+    Returns:
+        object: The value with every list replaced by a tuple.
+    """
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
+
+
+def validate_profile(settings, values):
+    """Check every setting in a profile and convert it to the setting's type.
+
+    Args:
+        settings (Settings): The settings the profile will be applied to.
+        values (dict): Setting values keyed by setting name.
+
+    Returns:
+        dict: The converted values, ready for Settings.apply_overrides().
+
+    Raises:
+        ValueError: Listing every invalid setting in the profile.
+    """
+    errors = []
+    converted = {}
+    for name, value in values.items():
+        if name in settings.difficulty_curves:
+            curve = settings.difficulty_curves[name]
+            current = curve.base if curve.integer else float(curve.base)
+        elif hasattr(settings, name):
+            current = getattr(settings, name)
+        else:
+            errors.append(f'unknown setting {name!r}')
+            continue
+        try:
+            value = _convert(name, value, current)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        if name in CHOICES:
+            items = value if isinstance(value, tuple) else (value,)
+            if not items or any(item not in CHOICES[name] for item in items):
+                errors.append(f'{name} must be one of '
+                    f'{", ".join(map(str, CHOICES[name]))}, not {value!r}')
+                continue
+        if name == 'key_bindings':
+            key_errors = _key_errors(value)
+            if key_errors:
+                errors.extend(key_errors)
+                continue
+        if name in POSITIVE and value is not None and value <= 0:
+            errors.append(f'{name} must be greater than zero, not {value!r}')
+        elif name in NON_NEGATIVE and value < 0:
+            errors.append(f'{name} must not be negative, not {value!r}')
+        else:
+            converted[name] = value
+    if errors:
+        raise ValueError('Invalid profile: ' + '; '.join(errors))
+    return converted
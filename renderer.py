@@ -0,0 +1,162 @@
+import pygame
+from weakref import WeakKeyDictionary
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+class Renderer:
+    """Draws the scene at an internal resolution and scales it to the window.
+
+    Gameplay always uses the Settings.screen_w x screen_h coordinate space.
+    The renderer maps those coordinates onto the off-screen target, whose
+    size is Settings.render_size, and pre-scales sprite images to
+    match.
+    """
+
+    # the supported ways of getting the target onto the window
+    MODES = ('smooth', 'fast', 'scaled')
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Create the window and the render target.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to game settings.
+
+        Raises:
+            ValueError: If Settings.render_mode is not a supported mode.
+        """
+        self.settings = game.settings
+        self.mode = self.settings.render_mode
+        if self.mode not in self.MODES:
+            raise ValueError(f'Unknown render mode {self.mode!r}')
+
+        # the gameplay coordinate space, independent of any resolution
+        self.boundaries = pygame.Rect((0, 0), self.settings.screen_size)
+        self.window_size = self.boundaries.size
+        self.render_size = self.settings.render_size
+        self.scale_x = self.render_size[0] / self.window_size[0]
+        self.scale_y = self.render_size[1] / self.window_size[1]
+        self.is_scaled = self.render_size != self.window_size
+
+        if self.settings.headless or self.mode == 'scaled':
+            # draw straight to the display, which is only render_size big;
+            # SDL stretches it to the window in 'scaled' mode
+            flags = pygame.SCALED if self.mode == 'scaled' else 0
+            self.window = pygame.display.set_mode(self.render_size, flags)
+            self.target = self.window
+        else:
+            self.window = pygame.display.set_mode(self.window_size)
+            if self.is_scaled:
+                self.target = pygame.Surface(self.render_size).convert()
+            else:
+                self.target = self.window
+
+        # scaled copies of sprite images, dropped with their source image
+        self._scaled_images = WeakKeyDictionary()
+
+    def prescale(self, image):
+        """Return a copy of an image scaled to the internal resolution.
+
+        Copies are cached, so each image is only scaled the first time it
+        is drawn.
+
+        Args:
+            image (pygame.Surface): An image sized for gameplay coordinates.
+
+        Returns:
+            pygame.Surface: The image sized for the render target.
+        """
+        if not self.is_scaled:
+            return image
+        scaled = self._scaled_images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (
+                max(1, round(width * self.scale_x)),
+                max(1, round(height * self.scale_y)),
+                )
+            # smoothscale only handles 24 and 32-bit images
+            if image.get_bitsize() in (24, 32):
+                scaled = pygame.transform.smoothscale(image, size)
+            else:
+                scaled = pygame.transform.scale(image, size)
+            self._scaled_images[image] = scaled
+        return scaled
+
+    def map_point(self, point):
+        """Convert a point from gameplay to render target coordinates.
+
+        Args:
+            point (tuple): The (x, y) gameplay position.
+
+        Returns:
+            tuple: The (x, y) position on the render target.
+        """
+        return (round(point[0] * self.scale_x), round(point[1] * self.scale_y))
+
+    def map_rect(self, rect):
+        """Convert a rect from gameplay to render target coordinates.
+
+        Args:
+            rect (pygame.Rect): The rect in gameplay coordinates.
+
+        Returns:
+            pygame.Rect: The rect on the render target.
+        """
+        if not self.is_scaled:
+            return rect
+        left, top = self.map_point(rect.topleft)
+        right, bottom = self.map_point(rect.bottomright)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def window_to_gameplay(self, pos):
+        """Convert a window position, such as the mouse, to gameplay coordinates.
+
+        Args:
+            pos (tuple): The (x, y) position reported by pygame.
+
+        Returns:
+            tuple: The (x, y) gameplay position.
+        """
+        if self.target is self.window and self.is_scaled:
+            return (pos[0] / self.scale_x, pos[1] / self.scale_y)
+        return pos
+
+    def blit(self, image, dest):
+        """Draw an image at a gameplay position.
+
+        Args:
+            image (pygame.Surface): The image sized for gameplay coordinates.
+            dest (pygame.Rect | tuple): Where to draw it in gameplay
+                coordinates, as a rect or an (x, y) top-left point.
+        """
+        if self.is_scaled:
+            if isinstance(dest, pygame.Rect):
+                dest = dest.topleft
+            self.target.blit(self.prescale(image), self.map_point(dest))
+        else:
+            self.target.blit(image, dest)
+
+    def fill(self, color, rect):
+        """Fill a gameplay rect with a solid color.
+
+        Args:
+            color (tuple): The RGB fill color.
+            rect (pygame.Rect): The area in gameplay coordinates.
+        """
+        self.target.fill(color, self.map_rect(rect))
+
+    def present(self):
+        """Scale the render target to the window and make it visible."""
+        if self.target is not self.window:
+            if self.mode == 'smooth':
+                pygame.transform.smoothscale(self.target, self.window_size,
+                    self.window
+                    )
+            else:
+                pygame.transform.scale(self.target, self.window_size,
+                    self.window
+                    )
+        pygame.display.flip()
@@ -1,4 +1,9 @@
 from pathlib import Path
+from difficulty import DifficultyCurve, DifficultyTable
+
+# assets are found next to the code, wherever the game is launched from
+BASE_DIR = Path(__file__).resolve().parent
+ASSETS_DIR = BASE_DIR / 'Assets'
 
 class Settings:
     """A class to store all settings for Alien Invasion."""
@@ -7,32 +12,161 @@ class Settings:
         """Initialize the game's static settings."""
         # game settings
         self.name: str = 'Alien Invasion'
+        # the profile applied with apply_profile(), if any
+        self.profile = None
         self.screen_w = 1200
         self.screen_h = 800
         self.FPS = 60
-        self.bg_file = Path.cwd() / 'Assets' / 'images' / 'Starbasesnow.png'
+        self.bg_file = ASSETS_DIR / 'images' / 'Starbasesnow.png'
         self.difficulty_scale = 1.1
-        self.scores_file = Path.cwd() / 'Assets' / 'file' / 'scores.json'
+        # the level new games start at
+        self.start_level = 1
+        # how many levels of difficulty to precompute
+        self.precomputed_levels = 100
+        # alien formations, cycled through level by level
+        self.formations = ('checker',)
+        self.difficulty_curves = self.default_difficulty_curves()
+        self.difficulty_table = None
+        self.scores_file = ASSETS_DIR / 'file' / 'scores.json'
+
+        # render settings
+        # the internal resolution the scene is drawn at before scaling
+        # None renders at the screen size
+        self.render_w = None
+        self.render_h = None
+        # 'smooth', 'fast' or 'scaled' (SDL's SCALED window flag)
+        self.render_mode = 'smooth'
+        # run without a window or sound device
+        self.headless = False
+        self.audio_enabled = True
+
+        # starfield settings
+        # how far the background image scrolls per frame; the image doesn't
+        # tile seamlessly, so it stays still and only the stars scroll
+        self.starfield_bg_speed = 0.0
+        # (speed, number of stars, star size, color) of each star layer,
+        # back to front; nearer layers scroll faster
+        self.starfield_layers = (
+            (1.0, 90, 2, (120, 120, 150)),
+            (2.0, 45, 3, (190, 190, 220)),
+            (4.0, 15, 4, (255, 255, 255)),
+            )
+        # height of the pre-rendered star strips
+        self.starfield_strip_h = 16
+        self.starfield_seed = 1
 
         # ship settings
-        self.ship_file = Path.cwd() / 'Assets' / 'images' / 'ship2(no bg).png'
+        self.ship_file = ASSETS_DIR / 'images' / 'ship2(no bg).png'
         self.ship_w = 40
         self.ship_h = 60
         self.ship_rotate = -90
+        self.staring_ship_count = 3
 
         # bullet settings
-        self.bullet_file = Path.cwd() / 'Assets' / 'images' / 'laserGreen.png'
-        self.laser_sound = Path.cwd() / 'Assets' / 'sound' / 'laser.mp3'
-        self.impact_sound = Path.cwd() / 'Assets' / 'sound' / 'impactSound.mp3'
+        self.bullet_file = ASSETS_DIR / 'images' / 'laserGreen.png'
+        self.laser_sound = ASSETS_DIR / 'sound' / 'laser.mp3'
+        self.impact_sound = ASSETS_DIR / 'sound' / 'impactSound.mp3'
         self.bullet_rotate = -90
+        self.bullet_w = 25
+        self.bullet_h = 80
 
         # alien settings
-        self.alien_file = Path.cwd() / 'Assets' / 'images' / 'enemy_4.png'
+        self.alien_file = ASSETS_DIR / 'images' / 'enemy_4.png'
         self.alien_w = 40
         self.alien_h = 40
         self.alien_rotate = -90
         self.fleet_direction = 1
 
+        # enemy fire settings
+        self.enemy_fire_enabled = True
+        self.enemy_projectile_file = ASSETS_DIR / 'images' / 'laserBlast.png'
+        self.enemy_projectile_w = 12
+        self.enemy_projectile_h = 30
+        self.enemy_projectile_speed = 6
+        # the most enemy projectiles in flight at once
+        self.enemy_projectile_capacity = 32
+        # average number of frames between enemy shots
+        self.enemy_fire_interval = 45
+        # seeds which aliens fire and when; None seeds from the system
+        self.enemy_fire_seed = None
+
+        # input settings
+        self.key_bindings = {
+            'up': 'up',
+            'down': 'down',
+            'fire': 'space',
+            'quit': 'q',
+            }
+        self.auto_fire = True
+        self.fire_rate = 8
+
+        # telemetry settings
+        self.telemetry_enabled = False
+        # written where the game is run from, like the capture directory
+        self.telemetry_dir = Path.cwd() / 'telemetry'
+        self.telemetry_capacity = 8192
+        # seconds between batched writes
+        self.telemetry_flush_interval = 1.0
+
+        # memory tracking settings, for finding leaks between levels
+        self.memory_tracking = False
+        # stack frames stored per allocation, more is slower but more precise
+        self.memory_trace_frames = 1
+        # levels played before the baseline sample, while caches fill up
+        self.memory_warmup_levels = 3
+        # bytes memory may grow after the baseline before it is flagged
+        self.memory_budget = 256 * 1024
+        self.memory_report_lines = 10
+
+        # frame capture settings, for recording gameplay
+        self.capture_enabled = False
+        # capture every Nth frame
+        self.capture_every = 1
+        # size of the captured frames relative to the render target
+        self.capture_scale = 1.0
+        # 'png' for numbered PNG files or 'raw' for one raw video stream
+        self.capture_format = 'png'
+        self.capture_dir = Path.cwd() / 'captures'
+        # frames that can wait for the encoder before new ones are dropped
+        self.capture_buffers = 8
+        # seconds to wait for the encoder to finish when stopping
+        self.capture_stop_timeout = 10
+
+        # texture atlas settings
+        self.atlas_width = 2048
+        # save the packed atlas so later runs load it with a single decode
+        self.atlas_cache = True
+        self.atlas_file = ASSETS_DIR / 'file' / 'atlas.png'
+        self.atlas_index_file = ASSETS_DIR / 'file' / 'atlas.json'
+        # extra animations to pack, e.g. {'name': 'enemy_5', 'file': path,
+        # 'areas': [(x, y, w, h), ...], 'size': (w, h), 'rotate': -90}
+        self.atlas_animations = ()
+
+        # particle settings
+        self.particle_file = ASSETS_DIR / 'images' / 'beams.png'
+        # sprite sheet areas of the explosion animation frames
+        self.particle_frames = ((9, 41, 11, 15), (6, 8, 16, 20), (5, 70, 18, 20))
+        self.flash_file = ASSETS_DIR / 'images' / 'laserBlast.png'
+        self.flash_size = (12, 22)
+        self.flash_life = 4
+        self.particle_capacity = 1024
+        # the most particles alive at once, the oldest are dropped beyond it
+        self.particle_budget = 512
+        self.explosion_particles = 12
+        self.particle_speed = 3
+        self.particle_life = 24
+
+        # co-op settings
+        self.coop_host = '127.0.0.1'
+        self.coop_port = 50007
+        # server ticks per second; None matches the frame rate the speeds assume
+        self.coop_tick_rate = None
+        self.coop_max_players = 4
+        # queued inputs beyond this are dropped so a lagging client catches up
+        self.coop_input_backlog = 6
+        # bytes a client may leave unread before the server drops it
+        self.coop_write_buffer_limit = 256 * 1024
+
         # button settings
         self.button_w = 200
         self.button_h = 50
@@ -40,25 +174,131 @@ class Settings:
         self.text_color = (255,255,255)
         self.button_font_size = 48
         self.HUD_font_size = 20
-        self.font_file = Path.cwd() / 'Assets' / 'Fonts' / 'Silkscreen' / 'Silkscreen-Bold.ttf'
+        self.font_file = ASSETS_DIR / 'Fonts' / 'Silkscreen' / 'Silkscreen-Bold.ttf'
+
+        self.derive()
+
+    def derive(self):
+        """Compute the values that follow from other settings.
+
+        Called once the settings are final, so the game never recomputes
+        them: after construction, after overrides and before a game starts.
+        """
+        self.screen_size = (self.screen_w, self.screen_h)
+        self.render_size = (
+            self.render_w if self.render_w is not None else self.screen_w,
+            self.render_h if self.render_h is not None else self.screen_h,
+            )
+        self.coop_rate = (
+            self.coop_tick_rate if self.coop_tick_rate is not None else self.FPS
+            )
+
+    def apply_profile(self, profile):
+        """Load a settings profile and apply it.
+
+        Args:
+            profile (str | Path): The name of a profile in
+                Assets/profiles, or the path of a .toml or .json file.
+
+        Raises:
+            FileNotFoundError: If there is no such profile.
+            ValueError: If the profile contains an invalid setting.
+        """
+        # imported here, profiles validates against the renderer and capture
+        from profiles import load_profile, validate_profile
+
+        self.apply_overrides(validate_profile(self, load_profile(profile)))
+        self.profile = profile
+
+    def default_difficulty_curves(self):
+        """Create the curves for the settings that change with the level.
+
+        Returns:
+            dict: DifficultyCurve objects keyed by setting name.
+        """
+        return {
+            'ship_speed': DifficultyCurve(5, self.difficulty_scale),
+            'bullet_speed': DifficultyCurve(7, self.difficulty_scale),
+            'fleet_speed': DifficultyCurve(2, self.difficulty_scale),
+            'fleet_drop_speed': DifficultyCurve(-40, self.difficulty_scale),
+            'bullet_amount': DifficultyCurve(6, integer=True),
+            'alien_points': DifficultyCurve(50, integer=True),
+        }
+
+    def apply_overrides(self, overrides):
+        """Change settings by name, e.g. from a tuning grid or a profile.
+
+        Names of level-dependent settings such as 'fleet_speed' set the value
+        at level 1 of their difficulty curve. Changing 'difficulty_scale'
+        recreates the default curves with the new scale.
+
+        Args:
+            overrides (dict): New values keyed by setting name.
+
+        Raises:
+            ValueError: If a name is not a known setting.
+        """
+        if 'difficulty_scale' in overrides:
+            self.difficulty_scale = overrides['difficulty_scale']
+            self.difficulty_curves = self.default_difficulty_curves()
+        for name, value in overrides.items():
+            if name == 'difficulty_scale':
+                continue
+            if name in self.difficulty_curves:
+                self.difficulty_curves[name].base = value
+            elif hasattr(self, name):
+                setattr(self, name, value)
+            else:
+                raise ValueError(f'Unknown setting {name!r}')
+        if self.difficulty_table is not None:
+            self.build_difficulty_table()
+        self.derive()
 
     def initialize_dynamic_settings(self):
         """Initialize settings that change throughout the game."""
-        self.ship_speed = 5
-        self.staring_ship_count = 3
+        self.derive()
+        self.build_difficulty_table()
+        self.apply_level(self.start_level)
 
-        self.bullet_speed = 7
-        self.bullet_amount = 6
-        self.bullet_w = 25
-        self.bullet_h = 80
+    def build_difficulty_table(self):
+        """Precompute the per-level settings from the difficulty curves.
+
+        Call this again after changing the curves or formations.
+        """
+        self.difficulty_table = DifficultyTable(self.difficulty_curves,
+            self.formations, self.precomputed_levels
+            )
+
+    def difficulty_for(self, level):
+        """Look up the settings for a level without applying them.
+
+        Args:
+            level (int): The game level, starting at 1.
 
-        self.fleet_speed = 2
-        self.fleet_drop_speed = -40
-        self.alien_points = 50
+        Returns:
+            dict: Setting values keyed by setting name.
+        """
+        return self.difficulty_table.lookup(level)
+
+    def apply_level(self, level):
+        """Set every level-dependent setting to its value at a level.
+
+        Args:
+            level (int): The game level, starting at 1.
+        """
+        self.apply_difficulty(self.difficulty_for(level))
+        self.difficulty_level = level
 
     def increase_difficulty(self):
         """Inscrease the speed of game elements."""
-        self.ship_speed *= self.difficulty_scale
-        self.bullet_speed *= self.difficulty_scale
-        self.fleet_speed *= self.difficulty_scale
-        self.fleet_drop_speed *= self.difficulty_scale
+        self.apply_level(self.difficulty_level + 1)
+
+    def apply_difficulty(self, values):
+        """Apply previously looked up settings.
+
+        Args:
+            values (dict): Setting values keyed by setting name, as returned
+                by difficulty_for().
+        """
+        for name, value in values.items():
+            setattr(self, name, value)
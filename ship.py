@@ -19,17 +19,13 @@ class Ship:
         # store references to the game and settings
         self.game = game
         self.settings = game.settings
-        self.screen = game.screen
+        self.renderer = game.renderer
 
         # get the screen's rectangular boundaries
-        self.boundaries = self.screen.get_rect()
+        self.boundaries = self.renderer.boundaries
 
-        # load the ship image, scale and rotate it according to the settings
-        self.image = pygame.image.load(self.settings.ship_file)
-        self.image = pygame.transform.scale(self.image, 
-            (self.settings.ship_w, self.settings.ship_h)
-            )
-        self.image = pygame.transform.rotate(self.image, self.settings.ship_rotate)
+        # get the scaled and rotated ship image from the texture atlas
+        self.image = game.atlas.get('ship')
 
         # get the rectangular area of the ship image
         self.rect = self.image.get_rect()
@@ -46,6 +42,8 @@ class Ship:
 
         # store a reference to the ship's arsenal
         self.arsenal = arsenal
+        # bullets are fired from this ship
+        self.arsenal.ship = self
 
     def _center_ship(self):
         """Set ship's inital postion"""
@@ -76,7 +74,7 @@ class Ship:
     def draw(self):
         """Draw the ship its arsenal of bullets on screen."""
         self.arsenal.draw()
-        self.screen.blit(self.image, self.rect)
+        self.renderer.blit(self.image, self.rect)
 
     def fire(self):
         """Tell the arsenal to fire a new bullet if possible.
@@ -84,7 +82,10 @@ class Ship:
             bool_: True if a bullet was fired, False otherwise (if the bullet
             limit was reached).
         """
-        return self.arsenal.fire_bullet()
+        fired = self.arsenal.fire_bullet()
+        if fired:
+            self.game.telemetry.emit('fire', self.y)
+        return fired
 
     def check_collisions(self, other_group):
         """Checks for collisions between the calling sprite group and another 
@@ -0,0 +1,250 @@
+import struct
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# magic bytes, layout version, bullet count, alien count, enemy projectile count
+HEADER = struct.Struct('<4sHHHH')
+# ship y, fleet direction, ship/bullet/fleet/drop speeds, bullet amount,
+# alien points, ships left, level, score, max score, hi score, game active,
+# enemy fire seed, shots and cooldown
+STATE = struct.Struct('<dbddddHIHHIIIBqIi')
+MAGIC = b'AISN'
+VERSION = 3
+
+
+def pack_state(game: 'AlienInvasion'):
+    """Pack the full game state into a compact binary snapshot.
+
+    The layout is a fixed header and state block followed by the x, y
+    positions of every bullet, then every alien and then every enemy
+    projectile as doubles.
+
+    Args:
+        game (AlienInvasion): The game whose state is packed.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    settings = game.settings
+    stats = game.game_stats
+    bullets = game.ship.arsenal.arsenal.sprites()
+    aliens = game.alien_fleet.fleet.sprites()
+    projectiles = game.enemy_arsenal.active
+
+    positions = array('d')
+    for bullet in bullets:
+        positions.append(bullet.x)
+        positions.append(bullet.rect.y)
+    for alien in aliens:
+        positions.append(alien.x)
+        positions.append(alien.y)
+    for projectile in projectiles:
+        positions.append(projectile.x)
+        positions.append(projectile.rect.y)
+
+    return b''.join((
+        HEADER.pack(MAGIC, VERSION, len(bullets), len(aliens),
+            len(projectiles)
+            ),
+        STATE.pack(game.ship.y, game.alien_fleet.fleet_direction,
+            settings.ship_speed, settings.bullet_speed, settings.fleet_speed,
+            settings.fleet_drop_speed, settings.bullet_amount,
+            settings.alien_points, stats.ships_left, stats.level, stats.score,
+            stats.max_score, stats.hi_score, game.game_active,
+            game.enemy_arsenal.base_seed, game.enemy_arsenal.shots,
+            game.enemy_arsenal.cooldown
+            ),
+        positions.tobytes(),
+        ))
+
+
+def restore_state(game: 'AlienInvasion', data):
+    """Restore the game to the state stored in a snapshot.
+
+    Args:
+        game (AlienInvasion): The game to restore.
+        data (bytes): A snapshot created by pack_state().
+
+    Raises:
+        ValueError: If the data is not a snapshot this version can read.
+    """
+    (magic, version, bullet_count, alien_count,
+        projectile_count) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a compatible game snapshot')
+    (ship_y, fleet_direction, ship_speed, bullet_speed, fleet_speed,
+        fleet_drop_speed, bullet_amount, alien_points, ships_left, level, score,
+        max_score, hi_score, game_active, fire_seed, shots,
+        cooldown) = STATE.unpack_from(data, HEADER.size)
+    positions = array('d')
+    positions.frombytes(
+        memoryview(data)[HEADER.size + STATE.size:]
+        )
+
+    # restore the dynamic settings, starting from the level's formation and
+    # difficulty so the settings the snapshot doesn't store match it too
+    settings = game.settings
+    settings.apply_level(level)
+    settings.ship_speed = ship_speed
+    settings.bullet_speed = bullet_speed
+    settings.fleet_speed = fleet_speed
+    settings.fleet_drop_speed = fleet_drop_speed
+    settings.bullet_amount = bullet_amount
+    settings.alien_points = alien_points
+
+    # restore the game statistics
+    stats = game.game_stats
+    stats.ships_left = ships_left
+    stats.level = level
+    stats.score = score
+    stats.max_score = max_score
+    stats.hi_score = hi_score
+    game.game_active = bool(game_active)
+
+    # restore the ship
+    game.ship.y = ship_y
+    game.ship.rect.y = ship_y
+
+    # restore the bullets
+    arsenal = game.ship.arsenal
+    arsenal.arsenal.empty()
+    for i in range(0, bullet_count * 2, 2):
+        bullet = arsenal.create_bullet()
+        bullet.x = positions[i]
+        bullet.rect.x = bullet.x
+        bullet.rect.y = positions[i + 1]
+        arsenal.arsenal.add(bullet)
+
+    # restore the fleet
+    fleet = game.alien_fleet
+    fleet.fleet_direction = fleet_direction
+    fleet.fleet.empty()
+    offset = bullet_count * 2
+    formation = [
+        (positions[i], positions[i + 1])
+        for i in range(offset, offset + alien_count * 2, 2)
+        ]
+    aliens = fleet.build_aliens(formation)
+    for alien, (x, y) in zip(aliens, formation):
+        # keep the exact positions the rects were truncated from
+        alien.x = x
+        alien.y = y
+    fleet.create_fleet(aliens)
+
+    # restore the enemy projectiles
+    enemy_arsenal = game.enemy_arsenal
+    enemy_arsenal.empty()
+    offset += alien_count * 2
+    for i in range(offset, offset + projectile_count * 2, 2):
+        if not enemy_arsenal.free:
+            break
+        projectile = enemy_arsenal.free.pop()
+        projectile.x = positions[i]
+        projectile.rect.x = projectile.x
+        projectile.rect.y = positions[i + 1]
+        enemy_arsenal.active.append(projectile)
+    enemy_arsenal.rects = [p.rect for p in enemy_arsenal.active]
+    # continue firing exactly as the game did after the snapshot
+    enemy_arsenal.restore(fire_seed, shots, cooldown)
+
+    # bring the HUD up to date
+    game.HUD.update_scores()
+    game.HUD.update_level()
+    # the prefetched level was prepared for the level before the restore
+    game.level_prefetcher.start()
+
+
+class SnapshotRing:
+    """Keeps the most recent snapshots in a fixed-size ring buffer."""
+
+    def __init__(self, capacity):
+        """Initialize an empty ring.
+
+        Args:
+            capacity (int): The number of snapshots to keep, e.g. the number
+                of frames in a few seconds of play.
+        """
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        # index of the slot the next snapshot is written to
+        self._next = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, data):
+        """Store a snapshot, overwriting the oldest one when the ring is full.
+
+        Args:
+            data (bytes): A snapshot created by pack_state().
+        """
+        self._slots[self._next] = data
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def record(self, game: 'AlienInvasion'):
+        """Pack the current game state and store it.
+
+        Args:
+            game (AlienInvasion): The game to snapshot.
+        """
+        self.push(pack_state(game))
+
+    def get(self, frames_back=0):
+        """Return a stored snapshot.
+
+        Args:
+            frames_back (int): How many snapshots before the latest one to
+                return. 0 returns the latest.
+
+        Returns:
+            bytes: The snapshot.
+
+        Raises:
+            IndexError: If the ring does not hold that many snapshots.
+        """
+        if not 0 <= frames_back < self.count:
+            raise IndexError('Snapshot is no longer in the ring')
+        return self._slots[(self._next - 1 - frames_back) % self.capacity]
+
+    def rewind(self, game: 'AlienInvasion', frames_back=0):
+        """Restore the game to a stored snapshot and forget the newer ones.
+
+        Args:
+            game (AlienInvasion): The game to restore.
+            frames_back (int): How many snapshots before the latest one to
+                restore. 0 restores the latest.
+        """
+        restore_state(game, self.get(frames_back))
+        self._next = (self._next - frames_back) % self.capacity
+        self.count -= frames_back
+
+    def clear(self):
+        """Forget every stored snapshot."""
+        self._slots = [None] * self.capacity
+        self._next = 0
+        self.count = 0
+
+
+def save_snapshot(game: 'AlienInvasion', path):
+    """Write the current game state to a file.
+
+    Args:
+        game (AlienInvasion): The game to save.
+        path (Path): The file to write.
+    """
+    path.write_bytes(pack_state(game))
+
+
+def load_snapshot(game: 'AlienInvasion', path):
+    """Restore the game state from a file written by save_snapshot().
+
+    Args:
+        game (AlienInvasion): The game to restore.
+        path (Path): The file to read.
+    """
+    restore_state(game, path.read_bytes())
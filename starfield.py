@@ -0,0 +1,147 @@
+import random
+import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# the transparent color of the star strips
+COLORKEY = (0, 0, 0)
+
+
+class StarLayer:
+    """One layer of the starfield, scrolling at its own speed.
+
+    The layer is a horizontal tile as wide as the render target, cut into
+    strips. Only strips that contain something are kept, so sparse layers
+    cost little to draw.
+    """
+
+    def __init__(self, strips, speed, width):
+        """Initialize the layer.
+
+        Args:
+            strips (list): (y, surface) of every strip, each surface as wide
+                as the tile.
+            speed (float): How far the layer scrolls per frame, in render
+                target pixels.
+            width (int): The width of the tile.
+        """
+        self.strips = strips
+        self.speed = speed
+        self.width = width
+        self.offset = 0.0
+
+    def update(self):
+        """Scroll the layer toward the left of the screen."""
+        self.offset = (self.offset + self.speed) % self.width
+
+    def blits(self):
+        """List the area-blits that draw the layer wrapped around the tile.
+
+        Each strip is drawn with two blits that together cover the width
+        of the screen exactly once.
+
+        Returns:
+            list: (surface, position, area) blit sequences.
+        """
+        offset = int(self.offset)
+        right = self.width - offset
+        sequences = []
+        for y, surface in self.strips:
+            height = surface.get_height()
+            sequences.append((surface, (0, y), (offset, 0, right, height)))
+            if offset:
+                sequences.append((surface, (right, y), (0, 0, offset, height)))
+        return sequences
+
+
+class Starfield:
+    """A horizontally scrolling, multi-layer parallax background.
+
+    The bottom layer is the background image, which stays still unless
+    Settings.starfield_bg_speed is set. Every layer above it is a set of
+    sparse star strips pre-rendered in the display format with an RLE
+    colorkey. Each frame every layer is drawn with wrapped area-blits, so
+    the cost is one screen of background plus the star strips, however
+    many layers there are.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Pre-render every layer of the starfield.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings, the renderer and the background.
+        """
+        self.settings = game.settings
+        self.renderer = game.renderer
+        self.target = self.renderer.target
+        self.size = self.renderer.render_size
+        self.rect = pygame.Rect((0, 0), self.size)
+        # speeds are in gameplay pixels, the layers scroll in render pixels
+        scale = self.renderer.scale_x
+        self.rng = random.Random(self.settings.starfield_seed)
+
+        self.layers = [
+            StarLayer([(0, game.bg)], self.settings.starfield_bg_speed * scale,
+                self.size[0]
+                )
+            ]
+        for speed, count, size, color in self.settings.starfield_layers:
+            self.layers.append(StarLayer(
+                self._render_strips(count, max(1, round(size * scale)), color),
+                speed * scale, self.size[0]
+                ))
+
+    def _render_strips(self, count, size, color):
+        """Scatter stars over a tile and cut it into display-format strips.
+
+        Args:
+            count (int): How many stars the layer has.
+            size (int): The size of each star in render pixels.
+            color (tuple): The RGB color of the stars.
+
+        Returns:
+            list: (y, surface) of every strip that has a star in it.
+        """
+        width, height = self.size
+        strip_h = self.settings.starfield_strip_h
+        stars = {}
+        for _ in range(count):
+            x = self.rng.randrange(width - size + 1)
+            y = self.rng.randrange(height - size + 1)
+            # keep each star inside a single strip
+            y = min(y, (y // strip_h + 1) * strip_h - size)
+            stars.setdefault(y // strip_h, []).append((x, y % strip_h))
+
+        strips = []
+        for band, points in sorted(stars.items()):
+            strip = pygame.Surface((width, min(strip_h, height - band * strip_h)))
+            strip = strip.convert()
+            strip.fill(COLORKEY)
+            for x, y in points:
+                strip.fill(color, (x, y, size, size))
+            # run-length encode the transparent gaps between the stars
+            strip.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            strips.append((band * strip_h, strip))
+        return strips
+
+    def update(self):
+        """Scroll every layer by one frame."""
+        for layer in self.layers:
+            layer.update()
+
+    def draw(self):
+        """Draw every layer, back to front, in one batch of blits.
+
+        Returns:
+            list: The areas of the render target that were drawn, for a
+            dirty-rect display update. The scrolling background covers the
+            whole target.
+        """
+        sequences = []
+        for layer in self.layers:
+            sequences.extend(layer.blits())
+        self.target.blits(sequences, doreturn=False)
+        return [self.rect]
@@ -0,0 +1,239 @@
+import gzip
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+# the names of the two values each kind of event carries
+EVENT_FIELDS = {
+    'fire': ('ship_y', None),
+    'hit': ('aliens', None),
+    'level_up': ('level', None),
+    'ship_lost': ('ships_left', 'score'),
+    'game_over': ('score', 'level'),
+    'frame': ('frame_ms', None),
+    'memory': ('traced_kb', 'surfaces'),
+    'transition': ('swap_ms', 'missed'),
+}
+
+
+class TelemetryRing:
+    """A fixed-size ring of events with one writer and one reader.
+
+    The game loop is the only thread that pushes and the writer thread is
+    the only one that drains, and each only advances its own counter, so
+    no lock is needed. When the ring is full new events are dropped and
+    counted rather than overwriting events that have not been written yet.
+    """
+
+    def __init__(self, capacity):
+        """Preallocate the ring.
+
+        Args:
+            capacity (int): The most events the ring can hold.
+        """
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        # total events pushed and drained, only ever increased
+        self._pushed = 0
+        self._drained = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self._pushed - self._drained
+
+    def push(self, event):
+        """Add an event. Only call this from the game loop.
+
+        Args:
+            event (tuple): The event.
+
+        Returns:
+            bool: False if the ring was full and the event was dropped.
+        """
+        if self._pushed - self._drained >= self.capacity:
+            self.dropped += 1
+            return False
+        self._slots[self._pushed % self.capacity] = event
+        self._pushed += 1
+        return True
+
+    def drain(self):
+        """Remove and return every event added so far. Only call this from
+        the writer thread.
+
+        Returns:
+            list: The events, oldest first.
+        """
+        end = self._pushed
+        events = [
+            self._slots[i % self.capacity] for i in range(self._drained, end)
+            ]
+        self._drained = end
+        return events
+
+
+class Telemetry:
+    """Records gameplay and performance events and streams them to a file.
+
+    Events go into a TelemetryRing and a background thread writes them in
+    batches as gzip-compressed newline-delimited JSON.
+    """
+
+    def __init__(self, game: 'AlienInvasion'):
+        """Initialize telemetry. Nothing is recorded unless it is enabled.
+
+        Args:
+            game (AlienInvasion): An instance of the AlienInvasion game class.
+                Provides access to settings and game statistics.
+        """
+        self.game = game
+        self.settings = game.settings
+        self.enabled = self.settings.telemetry_enabled
+        self.ring = TelemetryRing(self.settings.telemetry_capacity)
+        self.path = None
+        self.frame = 0
+        self._start = perf_counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Open the telemetry file and start the writer thread."""
+        if not self.enabled or self._thread is not None:
+            return
+        directory = self.settings.telemetry_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.path = directory / f'run-{stamp}-{os.getpid()}.ndjson.gz'
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._write_loop,
+            args=(self.path,), daemon=True
+            )
+        self._thread.start()
+
+    def emit(self, kind, a=0, b=0):
+        """Record an event.
+
+        Args:
+            kind (str): One of the EVENT_FIELDS kinds.
+            a (float): The event's first value.
+            b (float): The event's second value.
+        """
+        if self.enabled:
+            self.ring.push((kind, perf_counter() - self._start, self.frame, a, b))
+
+    def frame_done(self, seconds):
+        """Record how long a frame took and move on to the next one.
+
+        Args:
+            seconds (float): How long the frame's work took.
+        """
+        self.emit('frame', seconds * 1000)
+        self.frame += 1
+
+    def close(self):
+        """Write any remaining events and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _write_loop(self, path):
+        """Write batches of events until stopped. Runs on the writer thread.
+
+        Args:
+            path (Path): The file to write.
+        """
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            while True:
+                stopping = self._stop.wait(self.settings.telemetry_flush_interval)
+                events = self.ring.drain()
+                if events:
+                    file.write(''.join(self._encode(event) for event in events))
+                    # sync flush the batch, so the log can be read while the
+                    # game runs and survives the game dying without close()
+                    file.flush()
+                if stopping:
+                    break
+            if self.ring.dropped:
+                file.write(self._encode(
+                    ('dropped', perf_counter() - self._start, self.frame,
+                        self.ring.dropped, 0)
+                    ))
+
+    def _encode(self, event):
+        """Encode an event as a line of JSON.
+
+        Args:
+            event (tuple): The event as stored in the ring.
+
+        Returns:
+            str: The JSON line, ending with a newline.
+        """
+        kind, time, frame, a, b = event
+        record = {'event': kind, 'time': round(time, 6), 'frame': frame}
+        names = EVENT_FIELDS.get(kind, ('count', None))
+        record[names[0]] = a
+        if names[1] is not None:
+            record[names[1]] = b
+        return json.dumps(record) + '\n'
+
+
+def read_events(path, kinds=None):
+    """Stream events back from a telemetry file without loading it all.
+
+    Args:
+        path (Path): A file written by Telemetry.
+        kinds (set, optional): Only yield events of these kinds.
+
+    A file whose game died before closing it has no gzip trailer; its
+    events are read up to the last batch written.
+
+    Yields:
+        dict: One event at a time, oldest first.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        try:
+            for line in file:
+                event = json.loads(line)
+                if kinds is None or event['event'] in kinds:
+                    yield event
+        except EOFError:
+            # the stream ends without its trailer, every batch was flushed
+            return
+
+
+if __name__ == '__main__':
+    # summarize a telemetry file: python telemetry.py <file>
+    counts = {}
+    frames = 0
+    frame_ms = 0.0
+    worst_ms = 0.0
+    # the frames a level transition happened in, and how long they took
+    transition_frames = set()
+    transition_ms = []
+    for event in read_events(sys.argv[1]):
+        counts[event['event']] = counts.get(event['event'], 0) + 1
+        if event['event'] == 'transition':
+            transition_frames.add(event['frame'])
+        elif event['event'] == 'frame':
+            frames += 1
+            frame_ms += event['frame_ms']
+            worst_ms = max(worst_ms, event['frame_ms'])
+            if event['frame'] in transition_frames:
+                transition_ms.append(event['frame_ms'])
+    for kind, count in sorted(counts.items()):
+        print(f'{kind}: {count}')
+    if frames:
+        print(f'mean frame: {frame_ms / frames:.3f} ms, worst: {worst_ms:.3f} ms')
+    if transition_ms:
+        print(f'mean transition frame: '
+            f'{sum(transition_ms) / len(transition_ms):.3f} ms, '
+            f'worst: {max(transition_ms):.3f} ms')
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# run without a display or audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+# the game modules live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
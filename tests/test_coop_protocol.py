@@ -0,0 +1,110 @@
+import asyncio
+import struct
+import pytest
+import coop_protocol as protocol
+from coop_server import CoopServer
+from settings import Settings
+
+
+def test_welcome_round_trip():
+    payload = protocol.encode_welcome(3, 60, 10, 790, 48)
+    assert protocol.decode_welcome(payload) == {'player': 3, 'tick_rate': 60,
+        'top': 10, 'bottom': 790, 'ship_h': 48}
+
+
+def test_input_round_trip():
+    payload = protocol.encode_input(1234, protocol.UP | protocol.FIRE)
+    assert payload[0] == protocol.INPUT
+    assert protocol.decode_input(payload) == (1234, protocol.UP | protocol.FIRE)
+
+
+def test_state_round_trip_with_every_section():
+    positions = [(100, 50), (150, 50), (100, 110)]
+    alive = [True, False, True]
+    payload = b''.join((
+        protocol.encode_state_header(77, 12,
+            protocol.FLEET_FULL | protocol.FLEET_KILLS | protocol.STATS
+            ),
+        protocol.encode_fleet(positions, alive),
+        protocol.encode_kills([1]),
+        protocol.encode_stats(500, 900, 2, 3, True, 5.5),
+        protocol.encode_world((-4.0, 12.5), [(0, 300.0), (1, 420.0)],
+            [(60, 300)], [(500, 410), (700, 80)]
+            ),
+        ))
+    state = protocol.decode_state(payload)
+    assert state['tick'] == 77
+    assert state['ack'] == 12
+    assert state['fleet'] == (positions, alive)
+    assert state['kills'] == [1]
+    assert state['stats'] == {'score': 500, 'hi_score': 900, 'level': 2,
+        'ships_left': 3, 'game_active': True, 'ship_speed': 5.5}
+    assert state['offset'] == (-4.0, 12.5)
+    assert state['ships'] == [(0, 300.0), (1, 420.0)]
+    assert state['bullets'] == [(60, 300)]
+    assert state['projectiles'] == [(500, 410), (700, 80)]
+
+
+def test_state_round_trip_without_sections():
+    payload = (protocol.encode_state_header(5, 0, 0)
+        + protocol.encode_world((0.0, 0.0), [], [], []))
+    state = protocol.decode_state(payload)
+    assert 'fleet' not in state
+    assert 'kills' not in state
+    assert 'stats' not in state
+    assert state['ships'] == []
+    assert state['bullets'] == []
+
+
+def test_frames_round_trip():
+    async def read(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [await protocol.read_frame(reader) for _ in range(2)]
+
+    payloads = [protocol.encode_input(1, 0), b'']
+    data = b''.join(protocol.pack_frame(payload) for payload in payloads)
+    assert asyncio.run(read(data)) == payloads
+
+
+def test_oversized_frame_is_rejected():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(protocol.FRAME.pack(protocol.MAX_FRAME + 1))
+        return await protocol.read_frame(reader)
+
+    with pytest.raises(ValueError):
+        asyncio.run(read())
+
+
+def test_malformed_input_is_rejected():
+    with pytest.raises(struct.error):
+        protocol.decode_input(protocol.encode_input(1, 0)[:-1])
+
+
+@pytest.mark.parametrize('payload', [b'', bytes((protocol.INPUT, 1, 2))])
+def test_server_drops_client_sending_malformed_frame(payload):
+    async def play():
+        settings = Settings()
+        settings.telemetry_enabled = False
+        server = CoopServer(settings)
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        port = await server.start('127.0.0.1', 0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        welcome = protocol.decode_welcome(await protocol.read_frame(reader))
+        writer.write(protocol.pack_frame(payload))
+        await writer.drain()
+        # the server closes the connection, after any states already sent
+        await asyncio.wait_for(reader.read(), 5)
+        players = len(server.players)
+        await server.stop()
+        writer.close()
+        return welcome, players, errors
+
+    welcome, players, errors = asyncio.run(play())
+    assert welcome['player'] == 0
+    assert players == 0
+    assert errors == []
@@ -0,0 +1,112 @@
+import json
+import pytest
+import profiles
+from settings import Settings
+
+
+def errors_for(values):
+    """Validate a profile that must fail and return its error message."""
+    with pytest.raises(ValueError) as info:
+        profiles.validate_profile(Settings(), values)
+    return str(info.value)
+
+
+@pytest.mark.parametrize('name', profiles.available_profiles())
+def test_shipped_profiles_are_valid(name):
+    settings = Settings()
+    settings.apply_profile(name)
+    assert settings.profile == name
+
+
+def test_every_error_is_reported():
+    message = errors_for({'FPS': 0, 'nope': 1, 'audio_enabled': 1})
+    assert 'FPS must be greater than zero' in message
+    assert "unknown setting 'nope'" in message
+    assert 'audio_enabled must be true or false' in message
+
+
+@pytest.mark.parametrize('values, error', [
+    ({'alien_w': 0}, 'alien_w must be greater than zero'),
+    ({'ship_h': -5}, 'ship_h must be greater than zero'),
+    ({'start_level': 0}, 'start_level must be greater than zero'),
+    ({'fire_rate': 0}, 'fire_rate must be greater than zero'),
+    ({'particle_budget': 0}, 'particle_budget must be greater than zero'),
+    ({'telemetry_capacity': 0}, 'telemetry_capacity must be greater than zero'),
+    ({'memory_trace_frames': 0}, 'memory_trace_frames must be greater than zero'),
+    ({'enemy_fire_interval': -1}, 'enemy_fire_interval must not be negative'),
+    ({'ship_speed': -1.0}, 'ship_speed must not be negative'),
+    ({'fleet_direction': 0}, 'fleet_direction must be one of 1, -1'),
+    ])
+def test_out_of_range_values_are_rejected(values, error):
+    assert error in errors_for(values)
+
+
+def test_zero_is_allowed_where_it_is_safe():
+    converted = profiles.validate_profile(Settings(),
+        {'enemy_fire_interval': 0, 'explosion_particles': 0}
+        )
+    assert converted == {'enemy_fire_interval': 0, 'explosion_particles': 0}
+
+
+@pytest.mark.parametrize('values, error', [
+    ({'alien_w': 2.5}, 'alien_w must be a whole number'),
+    ({'ship_speed': 'fast'}, 'ship_speed must be a number'),
+    ({'render_w': 1.5}, 'render_w must be a whole number'),
+    ({'render_mode': 'x'}, 'render_mode must be one of'),
+    ({'formations': ['bogus']}, 'formations must be one of'),
+    ({'formations': []}, 'formations must be one of'),
+    ({'flash_size': [1, 2, 3]}, 'flash_size must be a list of 2 items'),
+    ({'button_color': [0, 1.5, 2]}, 'button_color[1] must be a whole number'),
+    ({'starfield_layers': [[1, 'x']]},
+        'starfield_layers[0] must be a list of 4 items'),
+    ({'starfield_layers': [[1, 'x', 2, [1, 2, 3]]]},
+        'starfield_layers[0][1] must be a number'),
+    ({'key_bindings': {'fire': 'nokey'}},
+        'key_bindings.fire must be a key name'),
+    ({'key_bindings': {'jump': 'x'}}, "key_bindings has no 'jump'"),
+    ])
+def test_wrong_types_and_shapes_are_rejected(values, error):
+    assert error in errors_for(values)
+
+
+def test_values_are_converted_to_the_settings_types():
+    settings = Settings()
+    converted = profiles.validate_profile(settings, {
+        'starfield_layers': [[0.5, 10, 2, [1, 2, 3]]],
+        'formations': ['block', 'columns'],
+        'key_bindings': {'fire': 'f'},
+        'capture_dir': 'shots',
+        'ship_speed': 4,
+        })
+    assert converted['starfield_layers'] == ((0.5, 10, 2, (1, 2, 3)),)
+    assert converted['formations'] == ('block', 'columns')
+    # bindings the profile leaves out keep their current keys
+    assert converted['key_bindings'] == {**settings.key_bindings, 'fire': 'f'}
+    assert converted['capture_dir'] == profiles.BASE_DIR / 'shots'
+    assert converted['ship_speed'] == 4
+
+
+def test_load_profile_from_toml_and_json(tmp_path):
+    toml_path = tmp_path / 'low.toml'
+    toml_path.write_text('FPS = 30\nformations = ["block"]\n')
+    json_path = tmp_path / 'high.json'
+    json_path.write_text(json.dumps({'FPS': 120}))
+    assert profiles.load_profile(toml_path) == {'FPS': 30,
+        'formations': ['block']}
+    assert profiles.load_profile(json_path) == {'FPS': 120}
+
+
+def test_missing_profile_lists_the_available_ones():
+    with pytest.raises(FileNotFoundError) as info:
+        profiles.find_profile('missing')
+    for name in profiles.available_profiles():
+        assert name in str(info.value)
+
+
+def test_apply_profile_updates_derived_settings(tmp_path):
+    path = tmp_path / 'small.toml'
+    path.write_text('render_w = 600\nrender_h = 400\nFPS = 30\n')
+    settings = Settings()
+    settings.apply_profile(path)
+    assert settings.render_size == (600, 400)
+    assert settings.coop_rate == 30
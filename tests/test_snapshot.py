@@ -0,0 +1,81 @@
+import pygame
+import pytest
+from alien_invasion import AlienInvasion
+from settings import Settings
+from snapshot import pack_state, restore_state
+
+
+@pytest.fixture
+def game():
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.telemetry_enabled = False
+    settings.atlas_cache = False
+    game = AlienInvasion(settings)
+    game.restart_game()
+    yield game
+    game.telemetry.close()
+
+
+def clear_level(game):
+    """Destroy the fleet and step once so the game levels up."""
+    game.alien_fleet.fleet.empty()
+    game.step()
+
+
+def test_restore_then_level_up(game):
+    for _ in range(4):
+        clear_level(game)
+    assert game.game_stats.level == 5
+    data = pack_state(game)
+
+    # play on past the snapshot, then go back to it
+    for _ in range(3):
+        clear_level(game)
+    restore_state(game, data)
+    assert game.game_stats.level == 5
+    assert game.settings.difficulty_level == 5
+    assert pack_state(game) == data
+
+    clear_level(game)
+    expected = game.settings.difficulty_for(6)
+    assert game.game_stats.level == 6
+    assert game.settings.difficulty_level == 6
+    assert game.settings.fleet_speed == expected['fleet_speed']
+    assert game.settings.formation == expected['formation']
+    # the HUD shows the new level, not one prefetched before the restore
+    level_image, _ = game.HUD.render_level(6, game.HUD.font)
+    assert (pygame.image.tobytes(game.HUD.level_image, 'RGBA')
+        == pygame.image.tobytes(level_image, 'RGBA'))
+
+
+def test_restore_earlier_level_then_level_up(game):
+    data = pack_state(game)
+    for _ in range(5):
+        clear_level(game)
+    restore_state(game, data)
+
+    clear_level(game)
+    assert game.game_stats.level == 2
+    assert game.settings.difficulty_level == 2
+    assert (game.settings.fleet_speed
+        == game.settings.difficulty_for(2)['fleet_speed'])
+
+
+def test_restore_replays_enemy_fire(game):
+    game.game_stats.ships_left = 1000
+    for _ in range(30):
+        game.step()
+    data = pack_state(game)
+
+    def play():
+        states = []
+        for _ in range(200):
+            game.step()
+            states.append(pack_state(game))
+        return states
+
+    first = play()
+    restore_state(game, data)
+    assert play() == first
@@ -0,0 +1,359 @@
+"""Play thousands of headless games per Settings variant for balance tuning.
+
+Run from the repository root, for example:
+
+    python tournament.py --grid '{"difficulty_scale": [1.1, 1.2], "fleet_speed": [2, 3]}' --games 1000
+
+Finished chunks of games are appended to a checkpoint file, so running the
+same command again after an interruption resumes where it stopped.
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+from settings import Settings
+
+
+class HeuristicPilot:
+    """Steers toward the nearest alien and fires whenever it can."""
+
+    def __init__(self, seed):
+        """Initialize the pilot.
+
+        Args:
+            seed (int): Seeds the pilot's aim and reaction noise, so each game
+                plays out differently but reproducibly.
+        """
+        self.rng = random.Random(seed)
+        self.target_y = None
+
+    def act(self, game):
+        """Set the ship's movement and fire for one frame.
+
+        Args:
+            game (AlienInvasion): The game being played.
+        """
+        # pick a new target now and then, like a player's reaction time
+        if self.target_y is None or self.rng.random() < 0.1:
+            aliens = game.alien_fleet.fleet.sprites()
+            if aliens:
+                nearest = min(aliens, key=lambda alien: alien.rect.x)
+                self.target_y = nearest.rect.centery + self.rng.gauss(0, 30)
+        ship = game.ship
+        if self.target_y is not None:
+            ship.moving_up = self.target_y < ship.rect.centery - 5
+            ship.moving_down = self.target_y > ship.rect.centery + 5
+        game.fire_bullet()
+
+
+class SweepPilot:
+    """A scripted pilot that sweeps up and down the screen while firing."""
+
+    def __init__(self, seed):
+        """Initialize the pilot.
+
+        Args:
+            seed (int): Seeds the direction the sweep starts in.
+        """
+        self.rng = random.Random(seed)
+        self.moving_up = self.rng.random() < 0.5
+
+    def act(self, game):
+        """Set the ship's movement and fire for one frame.
+
+        Args:
+            game (AlienInvasion): The game being played.
+        """
+        ship = game.ship
+        if ship.rect.top <= ship.boundaries.top:
+            self.moving_up = False
+        elif ship.rect.bottom >= ship.boundaries.bottom:
+            self.moving_up = True
+        ship.moving_up = self.moving_up
+        ship.moving_down = not self.moving_up
+        game.fire_bullet()
+
+
+PILOTS = {
+    'heuristic': HeuristicPilot,
+    'sweep': SweepPilot,
+}
+
+
+def headless_settings(overrides):
+    """Create settings for a fast headless game.
+
+    Args:
+        overrides (dict): Settings to change from their defaults.
+
+    Returns:
+        Settings: The settings.
+    """
+    settings = Settings()
+    settings.headless = True
+    settings.audio_enabled = False
+    settings.telemetry_enabled = False
+    # nothing is drawn, so keep the render target tiny
+    settings.render_w = settings.screen_w // 10
+    settings.render_h = settings.screen_h // 10
+    # don't overwrite the shared atlas cache with one for the tiny target
+    settings.atlas_cache = False
+    settings.apply_overrides(overrides)
+    return settings
+
+
+def play_game(game, pilot, max_frames):
+    """Play a single game to the end.
+
+    Args:
+        game (AlienInvasion): The game to play.
+        pilot (HeuristicPilot | SweepPilot): Controls the ship.
+        max_frames (int): Stop the game after this many frames.
+
+    Returns:
+        dict: The final score, level reached and survival time in seconds.
+    """
+    game.restart_game()
+    frames = 0
+    while game.game_active and frames < max_frames:
+        pilot.act(game)
+        game.step()
+        frames += 1
+    return {
+        'score': game.game_stats.score,
+        'level': game.game_stats.level,
+        'survival': frames / game.settings.FPS,
+    }
+
+
+def run_chunk(task):
+    """Play a chunk of games for one configuration. Runs in a worker process.
+
+    Args:
+        task (dict): The configuration index, overrides, chunk number, number
+            of games, pilot name and frame limit.
+
+    Returns:
+        dict: The task's configuration index and chunk number, plus the
+        results of every game.
+    """
+    # imported here so the pool's parent process never opens a display
+    from alien_invasion import AlienInvasion
+
+    game = AlienInvasion(headless_settings(task['overrides']))
+    pilot_class = PILOTS[task['pilot']]
+    results = []
+    for i in range(task['games']):
+        seed = hash((task['config'], task['chunk'], i))
+        # the aliens fire the same way whenever this game is replayed
+        game.enemy_arsenal.seed(seed)
+        results.append(play_game(game, pilot_class(seed), task['max_frames']))
+    return {'config': task['config'], 'chunk': task['chunk'], 'results': results}
+
+
+def expand_grid(grid):
+    """Expand a grid of setting values into every combination.
+
+    Args:
+        grid (dict): Lists of values keyed by setting name.
+
+    Returns:
+        list: One dict of overrides per combination.
+    """
+    names = sorted(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[name] for name in names))
+        ]
+
+
+def load_checkpoint(path, header):
+    """Read the finished chunks from a checkpoint file.
+
+    Args:
+        path (Path): The checkpoint file.
+        header (dict): Describes the run; a checkpoint for a different run
+            is not resumed.
+
+    Returns:
+        dict: Lists of game results keyed by (config, chunk).
+
+    Raises:
+        ValueError: If the checkpoint belongs to a different run.
+    """
+    done = {}
+    if not path.exists():
+        return done
+    with path.open() as file:
+        lines = iter(file)
+        first = next(lines, None)
+        if first is None:
+            return done
+        if json.loads(first) != header:
+            raise ValueError(f'{path} is a checkpoint for a different run')
+        for line in lines:
+            try:
+                chunk = json.loads(line)
+            except ValueError:
+                # a line cut short by an interruption
+                continue
+            done[(chunk['config'], chunk['chunk'])] = chunk['results']
+    return done
+
+
+def summarize(values):
+    """Describe the distribution of a list of numbers.
+
+    Args:
+        values (list): The numbers.
+
+    Returns:
+        dict: The mean, standard deviation, minimum, 10th percentile,
+        median, 90th percentile and maximum.
+    """
+    if len(values) > 1:
+        # inclusive, so the percentiles stay within the scores played
+        deciles = statistics.quantiles(values, n=10, method='inclusive')
+        p10, p90 = deciles[0], deciles[-1]
+        stdev = statistics.stdev(values)
+    else:
+        p10 = p90 = values[0]
+        stdev = 0.0
+    return {
+        'mean': statistics.fmean(values),
+        'stdev': stdev,
+        'min': min(values),
+        'p10': p10,
+        'median': statistics.median(values),
+        'p90': p90,
+        'max': max(values),
+    }
+
+
+def run_tournament(grid, games, chunk_size=50, workers=None, pilot='heuristic',
+        max_frames=60 * 60 * 5, checkpoint=Path('tournament_checkpoint.jsonl')):
+    """Play every configuration in a grid across a process pool.
+
+    Args:
+        grid (dict): Lists of setting values keyed by setting name.
+        games (int): How many games to play per configuration.
+        chunk_size (int): How many games a worker plays per task.
+        workers (int, optional): The number of worker processes. Defaults to
+            the number of CPUs.
+        pilot (str): The name of the pilot in PILOTS.
+        max_frames (int): The frame limit for a single game.
+        checkpoint (Path): The file finished chunks are appended to.
+
+    Returns:
+        list: For each configuration, its overrides and the distributions of
+        score, level reached and survival time.
+
+    Raises:
+        ValueError: If the pilot is unknown, games or chunk_size is less
+            than 1, or the checkpoint belongs to a different run.
+    """
+    if pilot not in PILOTS:
+        raise ValueError(f'Unknown pilot {pilot!r}')
+    if games < 1 or chunk_size < 1:
+        raise ValueError('games and chunk_size must be at least 1')
+    configs = expand_grid(grid)
+    header = {'grid': grid, 'games': games, 'chunk_size': chunk_size,
+        'pilot': pilot, 'max_frames': max_frames}
+    done = load_checkpoint(checkpoint, header)
+
+    tasks = []
+    for config, overrides in enumerate(configs):
+        # fail early on unknown setting names
+        headless_settings(overrides)
+        for chunk, start in enumerate(range(0, games, chunk_size)):
+            if (config, chunk) not in done:
+                tasks.append({'config': config, 'chunk': chunk,
+                    'overrides': overrides, 'pilot': pilot,
+                    'games': min(chunk_size, games - start),
+                    'max_frames': max_frames})
+
+    total = sum(task['games'] for task in tasks)
+    if done:
+        print(f'Resuming: {len(done)} chunks already played')
+    played = 0
+    start_time = perf_counter()
+    # a file left empty by an interruption still needs its header
+    new_checkpoint = not checkpoint.exists() or checkpoint.stat().st_size == 0
+    with checkpoint.open('a') as file, ProcessPoolExecutor(workers) as pool:
+        if new_checkpoint:
+            file.write(json.dumps(header) + '\n')
+        futures = [pool.submit(run_chunk, task) for task in tasks]
+        for future in as_completed(futures):
+            chunk = future.result()
+            done[(chunk['config'], chunk['chunk'])] = chunk['results']
+            file.write(json.dumps(chunk) + '\n')
+            file.flush()
+            played += len(chunk['results'])
+            rate = played / (perf_counter() - start_time)
+            print(f'\r{played}/{total} games, {rate:.1f} games/s', end='',
+                flush=True)
+    if tasks:
+        print()
+
+    report = []
+    for config, overrides in enumerate(configs):
+        results = [
+            result
+            for (done_config, _), chunk in sorted(done.items())
+            if done_config == config
+            for result in chunk
+            ]
+        report.append({
+            'overrides': overrides,
+            'games': len(results),
+            'score': summarize([r['score'] for r in results]),
+            'level': summarize([r['level'] for r in results]),
+            'survival': summarize([r['survival'] for r in results]),
+        })
+    return report
+
+
+def print_report(report):
+    """Print a tournament report as a table.
+
+    Args:
+        report (list): The report returned by run_tournament().
+    """
+    for entry in report:
+        print(f"{entry['overrides']} ({entry['games']} games)")
+        for name in ('score', 'level', 'survival'):
+            stats = entry[name]
+            print(f"  {name:>8}: mean {stats['mean']:>9.1f}  "
+                f"sd {stats['stdev']:>8.1f}  p10 {stats['p10']:>8.1f}  "
+                f"median {stats['median']:>8.1f}  p90 {stats['p90']:>8.1f}  "
+                f"max {stats['max']:>8.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--grid', default='{}',
+        help='JSON object of setting names to lists of values, or a JSON file')
+    parser.add_argument('--games', type=int, default=1000,
+        help='games per configuration')
+    parser.add_argument('--chunk-size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--pilot', choices=sorted(PILOTS), default='heuristic')
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 5)
+    parser.add_argument('--checkpoint', type=Path,
+        default=Path('tournament_checkpoint.jsonl'))
+    args = parser.parse_args()
+    if args.games < 1 or args.chunk_size < 1:
+        parser.error('--games and --chunk-size must be at least 1')
+
+    grid_path = Path(args.grid)
+    if grid_path.suffix == '.json' and grid_path.exists():
+        grid = json.loads(grid_path.read_text())
+    else:
+        grid = json.loads(args.grid)
+    print_report(run_tournament(grid, args.games, args.chunk_size,
+        args.workers, args.pilot, args.max_frames, args.checkpoint
+        ))